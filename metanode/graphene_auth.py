@@ -80,9 +80,10 @@ class GrapheneAuth:
         whitelist = self.metanode.whitelist  # DISCRETE SQL QUERY
         try:
             # ==============================================================================
-            account = self.metanode.account  # DISCRETE SQL QUERY
-            objects = self.metanode.objects  # DISCRETE SQL QUERY
-            assets = self.metanode.assets  # DISCRETE SQL QUERY
+            view = self.metanode.snapshot(
+                ["account", "objects", "assets"]
+            )  # SQL SNAPSHOT
+            account, objects, assets = view["account"], view["objects"], view["assets"]
             # ==============================================================================
             core_precision = int(objects["1.3.0"]["precision"])
             create = int(account["fees_account"]["create_graphene"])
@@ -469,8 +470,8 @@ class GrapheneAuth:
         # SCALE ORDER SIZE TO FUNDS ON HAND
         if self.constants.signing.AUTOSCALE or self.constants.signing.CORE_FEES:
             # ==========================================================================
-            metanode_assets = self.metanode.assets  # DISCRETE SQL QUERY
-            metanode_objects = self.metanode.objects  # DISCRETE SQL QUERY
+            view = self.metanode.snapshot(["assets", "objects"])  # SQL SNAPSHOT
+            metanode_assets, metanode_objects = view["assets"], view["objects"]
             # ==========================================================================
             metanode_currency = metanode_assets[currency_name]
             metanode_asset = metanode_assets[asset_name]
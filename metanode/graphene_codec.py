@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# DISABLE SELECT PYLINT TESTS
+# pylint: disable=bad-continuation, too-many-return-statements
+r"""
+ ╔════════════════════════════════════════════════════╗
+ ║ ╔═╗╦═╗╔═╗╔═╗╦ ╦╔═╗╔╗╔╔═╗  ╔╦╗╔═╗╔╦╗╔═╗╔╗╔╔═╗╔╦╗╔═╗ ║
+ ║ ║ ╦╠╦╝╠═╣╠═╝╠═╣║╣ ║║║║╣   ║║║║╣  ║ ╠═╣║║║║ ║ ║║║╣  ║
+ ║ ╚═╝╩╚═╩ ╩╩  ╩ ╩╚═╝╝╚╝╚═╝  ╩ ╩╚═╝ ╩ ╩ ╩╝╚╝╚═╝═╩╝╚═╝ ║
+ ╚════════════════════════════════════════════════════╝
+~
+COLUMNAR BINARY ENCODING OF BOOK, HISTORY AND FILLS
+~
+an optional compact alternative to json text, see MetanodeConfig.BINARY_ENCODING
+a list of equal length lists, eg. a history, is stored column by column
+as packed little endian arrays; a list of dicts with equal keys, eg. fills, likewise
+~
+header:  magic b"GMC", version, flags; flag 1 means the body is zlib compressed
+nodes:   T table of lists, R records of dicts, D dict of nodes, J json text
+columns: q int64, d float64, b bool, s strings indexing a table of distinct strings,
+         j json text of the whole column, eg. nested fee dicts or mixed types
+~
+decode(encode(sooth)) == json.loads(canonical(sooth))
+and equal sooths always encode equally, so content digests still vote
+"""
+# STANDARD MODULES
+import json
+import sys
+import zlib
+from array import array
+from struct import error as StructError
+from struct import pack, unpack_from
+
+# GRAPHENE MODULES
+from .graphene_utils import canonical
+
+MAGIC = b"GMC"
+VERSION = 1
+HEADER = "<3sBB"
+HEADER_SIZE = 5
+COMPRESSED = 1
+INT64 = (-(2**63), 2**63 - 1)
+
+
+def is_encoded(value) -> bool:
+    """
+    True if a column value is columnar binary, rather than json text
+    """
+    return isinstance(value, (bytes, memoryview)) and bytes(value[:3]) == MAGIC
+
+
+def loads(value):
+    """
+    decode a json column value, json text or columnar binary alike
+    """
+    if is_encoded(value):
+        return decode(value)
+    return json.loads(value)
+
+
+def packed(typecode, values) -> bytes:
+    """
+    little endian bytes of an array
+    """
+    values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpacked(typecode, blob, offset, count) -> tuple:
+    """
+    :return (list(), int()): count values of an array, and the offset after them
+    """
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    values.frombytes(blob[offset:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist(), end
+
+
+def text(string) -> bytes:
+    """
+    length prefixed utf8
+    """
+    string = string.encode()
+    return pack("<H", len(string)) + string
+
+
+def untext(blob, offset) -> tuple:
+    """
+    :return (str(), int()): a length prefixed utf8 string, and the offset after it
+    """
+    length = unpack_from("<H", blob, offset)[0]
+    offset += 2
+    return bytes(blob[offset : offset + length]).decode(), offset + length
+
+
+def encode_json(obj) -> bytes:
+    """
+    length prefixed canonical json
+    """
+    obj = canonical(obj).encode()
+    return pack("<I", len(obj)) + obj
+
+
+def encode_column(column) -> bytes:
+    """
+    one column of a table; the narrowest exact type of every value in it
+    """
+    kinds = {type(i) for i in column}
+    if kinds == {int} and INT64[0] <= min(column) and max(column) <= INT64[1]:
+        return b"q" + packed("q", column)
+    if kinds == {float}:
+        return b"d" + packed("d", column)
+    if kinds == {bool}:
+        return b"b" + bytes(column)
+    if kinds == {str}:
+        strings = sorted(set(column))
+        if len(strings) <= 0xFFFF and all(len(i.encode()) <= 0xFFFF for i in strings):
+            index = {string: idx for idx, string in enumerate(strings)}
+            return (
+                b"s"
+                + pack("<H", len(strings))
+                + b"".join(text(i) for i in strings)
+                + packed("H", [index[i] for i in column])
+            )
+    return b"j" + encode_json(list(column))
+
+
+def decode_column(blob, offset, count) -> tuple:
+    """
+    :return (list(), int()): one column of count values, and the offset after it
+    """
+    kind = blob[offset : offset + 1]
+    offset += 1
+    if kind == b"q":
+        return unpacked("q", blob, offset, count)
+    if kind == b"d":
+        return unpacked("d", blob, offset, count)
+    if kind == b"b":
+        return [bool(i) for i in blob[offset : offset + count]], offset + count
+    if kind == b"s":
+        strings = []
+        distinct = unpack_from("<H", blob, offset)[0]
+        offset += 2
+        for _ in range(distinct):
+            string, offset = untext(blob, offset)
+            strings.append(string)
+        index, offset = unpacked("H", blob, offset, count)
+        return [strings[i] for i in index], offset
+    if kind == b"j":
+        return decode_json(blob, offset)
+    raise ValueError(f"unknown column type {kind}")
+
+
+def decode_json(blob, offset) -> tuple:
+    """
+    :return (obj, int()): length prefixed json, and the offset after it
+    """
+    length = unpack_from("<I", blob, offset)[0]
+    offset += 4
+    return json.loads(bytes(blob[offset : offset + length])), offset + length
+
+
+def encode_node(obj) -> bytes:
+    """
+    the columnar form of a sooth, or of part of one
+    """
+    if isinstance(obj, dict) and len(obj) <= 0xFFFF:
+        if all(isinstance(i, str) for i in obj):
+            return (
+                b"D"
+                + pack("<H", len(obj))
+                + b"".join(text(k) + encode_node(obj[k]) for k in sorted(obj))
+            )
+    if isinstance(obj, (list, tuple)) and obj and len(obj) <= 0xFFFFFFFF:
+        first = obj[0]
+        # a table; every row a list of the same length
+        if isinstance(first, (list, tuple)) and 0 < len(first) <= 0xFFFF:
+            if all(isinstance(i, (list, tuple)) and len(i) == len(first) for i in obj):
+                return (
+                    b"T"
+                    + pack("<IH", len(obj), len(first))
+                    + b"".join(encode_column(i) for i in zip(*obj))
+                )
+        # records; every row a dict with the same keys
+        if isinstance(first, dict) and 0 < len(first) <= 0xFFFF:
+            keys = sorted(first)
+            if all(isinstance(i, str) for i in keys) and all(
+                isinstance(i, dict)
+                and len(i) == len(keys)
+                and all(k in i for k in keys)
+                for i in obj
+            ):
+                return (
+                    b"R"
+                    + pack("<IH", len(obj), len(keys))
+                    + b"".join(text(i) for i in keys)
+                    + b"".join(encode_column([i[k] for i in obj]) for k in keys)
+                )
+    return b"J" + encode_json(obj)
+
+
+def decode_node(blob, offset) -> tuple:
+    """
+    :return (obj, int()): one node, and the offset after it
+    """
+    kind = blob[offset : offset + 1]
+    offset += 1
+    if kind == b"D":
+        obj = {}
+        keys = unpack_from("<H", blob, offset)[0]
+        offset += 2
+        for _ in range(keys):
+            key, offset = untext(blob, offset)
+            obj[key], offset = decode_node(blob, offset)
+        return obj, offset
+    if kind == b"T":
+        rows, width = unpack_from("<IH", blob, offset)
+        offset += 6
+        columns = []
+        for _ in range(width):
+            column, offset = decode_column(blob, offset, rows)
+            columns.append(column)
+        return [list(i) for i in zip(*columns)], offset
+    if kind == b"R":
+        rows, width = unpack_from("<IH", blob, offset)
+        offset += 6
+        keys = []
+        for _ in range(width):
+            key, offset = untext(blob, offset)
+            keys.append(key)
+        columns = []
+        for _ in range(width):
+            column, offset = decode_column(blob, offset, rows)
+            columns.append(column)
+        return [dict(zip(keys, i)) for i in zip(*columns)], offset
+    if kind == b"J":
+        return decode_json(blob, offset)
+    raise ValueError(f"unknown node type {kind}")
+
+
+def encode(sooth, level=1) -> bytes:
+    """
+    columnar binary of a sooth; zlib compressed at level when that is smaller
+    """
+    try:
+        body = encode_node(sooth)
+    # eg. a string or a key too long for its length prefix
+    except StructError:
+        body = b"J" + encode_json(sooth)
+    flags = 0
+    if level:
+        compressed = zlib.compress(body, level)
+        if len(compressed) < len(body):
+            body, flags = compressed, COMPRESSED
+    return pack(HEADER, MAGIC, VERSION, flags) + body
+
+
+def decode(blob):
+    """
+    the sooth of a columnar binary, as json.loads() of its canonical json
+    """
+    magic, version, flags = unpack_from(HEADER, blob)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not columnar binary version {VERSION}")
+    body = blob[HEADER_SIZE:]
+    if flags & COMPRESSED:
+        body = zlib.decompress(body)
+    return decode_node(body, 0)[0]
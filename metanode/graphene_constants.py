@@ -211,6 +211,56 @@ class MetanodeConfig:
         "timing",
     ]
     # ==================================================================================
+    # SECURITY hard coded columns prevent SQL injection in GrapheneTrustlessClient.get()
+    # the first column of each table is the key of its rows
+    # ==================================================================================
+    VALID_COLUMNS = {
+        "chain": ["name", "id"],
+        "account": ["name", "id", "fees_account", "ltm", "cancels"],
+        "objects": ["id", "name", "precision"],
+        "pairs": [
+            "name",
+            "id",
+            "invert_pair",
+            "invert_id",
+            "ops",
+            "last",
+            "book",
+            "history",
+            "opens",
+            "fills",
+        ],
+        "assets": ["name", "id", "precision", "supply", "fees_asset", "balance"],
+        "nodes": [
+            "url",
+            "ping",
+            "handshake",
+            "blocktime",
+            "code",
+            "status",
+            "ewma_ping",
+            "ewma_handshake",
+            "error_rate",
+            "timeout_rate",
+            "minority_rate",
+            "sampled",
+            "probed",
+        ],
+        "timing": [
+            "name",
+            "blocknum",
+            "blocktime",
+            "server",
+            "ping",
+            "handshake",
+            "read",
+            "begin",
+            "handover",
+            "warm",
+            "contention",
+        ],
+    }
+    # ==================================================================================
     # SECURITY this hard coded list prevents SQL injection in maven and oracle updates
     # ==================================================================================
     TRACKER_TABLE = {
@@ -251,17 +301,94 @@ class MetanodeConfig:
     DEV = True  # additional printing in terminal
     REGENERATION_TUPLE = randint(120, 240)
     MAVENS = 7  # number of processes collecting data
+    # reuse a database built for the same chain, account, and pairs on restart
+    WARM_START = True
+    # seconds before regeneration a standby maven is spawned, and connects
+    MAVEN_STANDBY_LEAD = 10
+    # seconds a retired maven has to exit cleanly before it is terminated
+    MAVEN_DRAIN_JOIN = 10
     MAVEN_WINDOW = 7  # window depth for mode(sooths)
     LATENCY_THRESHER_TIMEOUT = 10  # if status 1008 on all nodes, increase
     LATENCY_TASK_PAUSE = 60  # time between testing same node twice
+    # nodes with passive latency from maven rpc traffic newer than this are not probed
+    LATENCY_PASSIVE_WINDOW = 120
+    # yet every node is probed this often; chain id, participation, and stale blocks
+    LATENCY_PROBE_MAX = 900
     MAVEN_CACHE_HARVEST_JOIN = 8
     CACHE_RESTART_JOIN = 10
     MAVEN_RPC_RATIO = 3
-    MAVEN_HIGH_LOW_RATIO = 20
     MAVEN_PAUSE = 0.1
-    ORACLE_PAUSE = 0.5
+    ORACLE_PAUSE = 0.5  # longest oracle sleep when no maven window has changed
     MAX_PING = 1
     SQL_EXECUTE_PAUSE = (0.2, True)
+    SQL_BUSY_TIMEOUT = 5  # seconds sqlite waits on a locked database before raising
+    SQL_STATEMENT_CACHE = 256  # compiled statements sqlite keeps per connection
+    CONTENTION_REPORT = 60  # seconds between lock contention reports to timing
+    GET_CACHE = 256  # metanode.get() results kept per table, of its current version
+    # "sqlite" maven windows in maven_samples; "shared" maven windows in shared memory
+    # with "shared" the database only holds the oracle outputs that clients read
+    MAVEN_TRANSPORT = "sqlite"
+    # store these trackers as columnar binary instead of json text, see graphene_codec
+    # either way clients read the same python objects
+    BINARY_ENCODING = False
+    BINARY_TRACKERS = ["book", "history", "fills"]
+    BINARY_ZLIB_LEVEL = 1  # 0 leaves the packed columns uncompressed
+    # seconds of market trades kept in the trades table, see metanode.trades()
+    TRADES_RETENTION = 7 * 86400
+    # "process" runs MAVENS processes, each with one blocking websocket
+    # "asyncio" runs one process and event loop with one websocket per whitelisted node
+    MAVEN_ENGINE = "process"
+    # pipeline the pair calls of each maven cycle on one websocket, see wss_query_many
+    MAVEN_PIPELINE = True
+    # poll only markets with a subscribe_to_market notice, see maven_subscription
+    MAVEN_SUBSCRIBE = False
+    # poll account ops, opens, balances and fills only after an account object notice
+    MAVEN_ACCOUNT_WATCH = False
+    # poll each node once per new head block, or while jobs are left over by the budget
+    # when idle a maven rotates to a node not polled within MAVEN_BLOCK_INTERVAL
+    # else it keeps its connection and waits until the next block is expected
+    MAVEN_BLOCK_GATE = True
+    MAVEN_BLOCK_INTERVAL = 3
+    # with a subscription everything is still polled once per so many intervals
+    # account and market history and fills are also fetched whole then
+    # otherwise only newer
+    MAVEN_RECONCILE = 10
+    # fills fetched per market while its latest 100 are held, see fill_order_history
+    MAVEN_FILLS_NEWER = 10
+    # tracker: (seconds between refreshes, priority) see graphene_scheduler.py
+    MAVEN_SCHEDULE = {
+        "opens": (3, 5),
+        "ops": (3, 5),
+        "fills": (3, 4),
+        "balance": (3, 4),
+        "book": (1, 3),
+        "last": (3, 3),
+        "history": (6, 2),
+        "blocknum": (3, 1),
+        "blocktime": (3, 1),
+        "fees_account": (60, 0),
+        "fees_asset": (60, 0),
+        "supply": (60, 0),
+        "ltm": (300, 0),
+    }
+    # most tracker jobs served in one maven cycle
+    MAVEN_BUDGET = 24
+    # priority added for pairs holding our open orders, and for changed sooths
+    MAVEN_BOOSTS = {"orders": 2, "changed": 1}
+    # node scores; weight of the newest sample in each moving average of the nodes
+    NODE_EWMA = 0.2
+    # floor on every node weight, so a poorly scored node is still sampled now and then
+    NODE_WEIGHT_FLOOR = 0.01
+    # bytes per shared memory slot by tracker, oversize sooths are dropped
+    SHARED_SLOT_BYTES = {
+        "default": 512,
+        "book": 16384,
+        "history": 32768,
+        "fills": 65536,
+        "ops": 32768,
+        "opens": 16384,
+        "cancels": 32768,
+    }
 
 
 class SigningConfig:
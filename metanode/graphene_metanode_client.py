@@ -30,27 +30,60 @@ with collection procedures offering 99.9999% uptime
 """
 # STANDARD MODULES
 from json import loads
+from random import random
+from types import MappingProxyType
 
 # GRAPHENE MODULES
 from .graphene_constants import GrapheneConstants
-from .graphene_sql import Sql
-from .graphene_utils import it, ld2dd, two_tone
+from .graphene_sql import STMT, TRADES_BY_SEQUENCE, TRADES_BY_TIME, Sql, json_rows
+from .graphene_utils import freeze, it, ld2dd, two_tone
 from .unit_test_dbux import convert
 
+# {(database, table): (version, rows)} shared by every client of this process
+TABLES = {}
+# {(database, table): (version, {(rows, fields): result})} of metanode.get()
+# only the current version of each table is kept, at most GET_CACHE results of it
+GETS = {}
+# {(database, table): (rows, frozen view)} of GrapheneTrustlessClient.snapshot()
+VIEWS = {}
+
+
+def node_weight(node: dict, constants: GrapheneConstants) -> float:
+    """
+    the sampling weight of one row of the nodes table
+    ~
+    reliability / expected latency of one maven cycle
+    reliability is the chance a call neither errors, times out, nor is outvoted
+    the moving averages stand in for the latest probe once they exist
+    """
+    reliability = 1.0
+    for rate in ["error_rate", "timeout_rate", "minority_rate"]:
+        reliability *= 1 - min(1.0, node.get(rate) or 0.0)
+    ping = node.get("ewma_ping") or node["ping"] or 0.0
+    handshake = node.get("ewma_handshake") or node["handshake"] or 0.0
+    # one handshake every MAVEN_RPC_RATIO cycles
+    latency = ping + handshake / constants.metanode.MAVEN_RPC_RATIO
+    return max(constants.metanode.NODE_WEIGHT_FLOOR, reliability / max(latency, 0.001))
+
 
 class GrapheneTrustlessClient:
     """
     metanode = GrapheneTrustlessClient()
     metanode.whitelist
+    metanode.sampled_whitelist
     metanode.account
     metanode.timing
     metanode.assets
     metanode.chain
     metanode.nodes
     metanode.pairs
+    metanode.get(table, row, fields)
+    metanode.snapshot(tables)
+    metanode.trades(pair, start, stop, after, until, limit)
     ~
-    every metanode.xyz method is a SQL database query and should be cached
-    at time of use to dict(metanode_xyz) to avoid excess database lookups
+    every metanode.xyz method reads one table, which is cached by table version
+    while the table is unchanged a read costs one PRAGMA data_version
+    each call returns its own copy of the cached rows, which callers may change freely
     the format of each response is described in the docstrings below
     all of the data returned is as as a list or dict python object
     loaded from json and containing str/float/int values
@@ -64,19 +97,175 @@ class GrapheneTrustlessClient:
 
     def _get_table(self, table):
         if table in self.constants.metanode.VALID_TABLES:
+            # independent copies; changing one never reaches the cache, see LazyRow
+            return [i.copy() for i in self._read([table])[table]]
+        raise ValueError("invalid table")
+
+    def _read(self, tables) -> dict:
+        """
+        {table: rows} of every table as of one instant, in one read transaction
+        rows of an unchanged table version are reused from the cache
+        """
+        database = self.constants.chain.DATABASE
+        versions = self.sql.table_versions()
+        # every table is cached at its current version; the cache is consistent
+        if versions and all(
+            TABLES.get((database, i), (None,))[0] == versions.get(i) for i in tables
+        ):
+            return {i: TABLES[(database, i)][1] for i in tables}
+
+        def read(cur):
+            current = {}
+            if versions:
+                cur.execute("SELECT tbl, version FROM versions")
+                current = dict(tuple(i) for i in cur.fetchall())
+            rows = {}
+            for table in tables:
+                cached = TABLES.get((database, table))
+                if cached is not None and cached[0] == current.get(table, False):
+                    rows[table] = cached[1]
+                    continue
+                cur.execute(STMT.select_table(table))
+                rows[table] = json_rows(cur.fetchall())
+                if table in current:
+                    TABLES[(database, table)] = (current[table], rows[table])
+            return rows
+
+        # ==============================================================================
+        # SQL CONNECT ** one read transaction, one snapshot of the database **
+        # ==============================================================================
+        return self.sql.transaction(read, mode="DEFERRED")
+        # ==============================================================================
+        # SQL CLOSE
+        # ==============================================================================
+
+    def _format(self, table, rows):
+        """
+        the python object of a table, as returned by metanode.<table>
+        """
+        if table == "account":
+            return {k: v if k != "cancels" else loads(v) for k, v in rows[0].items()}
+        if table in ["chain", "timing"]:
+            return rows[0]
+        return ld2dd(rows, key=self.constants.metanode.VALID_COLUMNS[table][0])
+
+    def snapshot(self, tables) -> MappingProxyType:
+        """
+        several tables read in one read transaction; the oracle cannot write between
+        ~
+        view = metanode.snapshot(["account", "objects", "assets"])
+        view["assets"] is as metanode.assets; and so on
+        ~
+        the view is read only throughout; dicts are MappingProxyType, lists are tuples
+        frozen views are shared by table version, so an unchanged table costs nothing
+        """
+        for table in tables:
+            if table not in self.constants.metanode.VALID_TABLES:
+                raise ValueError("invalid table")
+        database = self.constants.chain.DATABASE
+        views = {}
+        for table, rows in self._read(tables).items():
+            frozen = VIEWS.get((database, table), (None, None))
+            # the rows are not those last frozen; the table version has changed
+            if frozen[0] is not rows:
+                frozen = (rows, freeze(self._format(table, [i.copy() for i in rows])))
+                VIEWS[(database, table)] = frozen
+            views[table] = frozen[1]
+        return MappingProxyType(views)
+
+    def get(self, table, row=None, fields=None) -> dict:
+        """
+        read only some columns of some rows; only json of those columns is decoded
+        ~
+        metanode.get("pairs", row="BTC-USD", fields=["last"])
+        returns {"last": float} of that row
+        metanode.get("pairs", row=["BTC-USD", "ETH-USD"], fields=["last", "book"])
+        metanode.get("pairs", fields=["last"])
+        returns a dict of dicts keyed by row, as metanode.pairs
+        ~
+        :param str(table): one of VALID_TABLES
+        :param str|list(row): the key of one row, or a list of keys; None for all rows
+        :param list(fields): columns of VALID_COLUMNS[table]; None for all columns
+        """
+        if table not in self.constants.metanode.VALID_TABLES:
+            raise ValueError("invalid table")
+        columns = self.constants.metanode.VALID_COLUMNS[table]
+        fields = list(columns[1:] if fields is None else fields)
+        if any(i not in columns for i in fields):
+            raise ValueError("invalid column")
+        key = columns[0]
+        rows = [row] if isinstance(row, str) else row
+        cache = (None if rows is None else tuple(rows), tuple(fields))
+        version = self.sql.table_versions().get(table)
+        gets = GETS.get((self.constants.chain.DATABASE, table), (None, {}))
+        # the results of an older version of this table are dropped with it
+        gets = gets[1] if version is not None and gets[0] == version else {}
+        result = gets.get(cache)
+        if result is None:
+            query = STMT.select_columns(
+                table,
+                [key] + [i for i in fields if i != key],
+                None if rows is None else len(rows),
+            )
+            values = tuple() if rows is None else tuple(rows)
             # ==========================================================================
-            # SECURITY - SQL INJECTION RISK at {table} fstring
+            result = self.sql.execute(query, values)  # DISCRETE SQL QUERY
             # ==========================================================================
-            dml = {
-                "query": f"""
-                SELECT * FROM {table}
-                """,
-                "values": tuple(),
+            for item in result:
+                if "cancels" in item:
+                    item["cancels"] = loads(item["cancels"])
+            # json columns stay text in the cache; each copy decodes on its own
+            result = {
+                item[key]: item if key in fields else item.without(key)
+                for item in result
             }
-            # ==========================================================================
-            return self.sql.execute([dml])  # DISCRETE SQL QUERY
-            # ==========================================================================
-        raise ValueError("invalid table")
+            if version is not None:
+                if len(gets) >= self.constants.metanode.GET_CACHE:
+                    gets.pop(next(iter(gets)))
+                gets[cache] = result
+                GETS[(self.constants.chain.DATABASE, table)] = (version, gets)
+        # copies, as _get_table() returns them
+        if isinstance(row, str):
+            return result[row].copy()
+        return {k: v.copy() for k, v in result.items()}
+
+    def trades(
+        self, pair, start=None, stop=None, after=None, until=None, limit=None
+    ) -> list:
+        """
+        market trades of a pair kept for TRADES_RETENTION, oldest first
+        ~
+        metanode.trades("BTC-USD", start=time.time() - 3600)
+        returns the trades of the last hour
+        metanode.trades("BTC-USD", after=sequence)
+        returns only the trades since the one with that sequence
+        ~
+        :param str(pair): one of PAIRS
+        :param int(start): unix, earliest trade time, inclusive
+        :param int(stop): unix, latest trade time, exclusive
+        :param int(after): earliest trade sequence, exclusive
+        :param int(until): latest trade sequence, inclusive
+        :param int(limit): the earliest so many trades in range; None for all
+        :return list(): [[unix, price, amount, type, sequence], ...] as pairs history
+        """
+        values = (
+            pair,
+            -(2**63) if start is None else start,
+            2**63 - 1 if stop is None else stop,
+            -(2**63) if after is None else after,
+            2**63 - 1 if until is None else until,
+            -1 if limit is None else limit,
+        )
+        # the primary key serves a sequence range, the (pair, unix) index a time range
+        query = (
+            TRADES_BY_TIME if after is None and until is None else TRADES_BY_SEQUENCE
+        )
+        # ==============================================================================
+        rows = self.sql.execute(query, values)  # DISCRETE SQL QUERY
+        # ==============================================================================
+        return [
+            [i["unix"], i["price"], i["amount"], i["type"], i["sequence"]] for i in rows
+        ]
 
     @property
     def chain(self) -> dict:
@@ -85,7 +274,7 @@ class GrapheneTrustlessClient:
         ~
         ["id", "name"]
         """
-        return self._get_table("chain")[0]
+        return self._format("chain", self._get_table("chain"))
 
     @property
     def account(self) -> dict:
@@ -94,9 +283,7 @@ class GrapheneTrustlessClient:
         ~
         ["id", "name", "fees_account", "ltm", "cancels"]
         """
-        return {
-            k: v if k != "cancels" else loads(v) for k, v in self._get_table("account")[0].items()
-        }
+        return self._format("account", self._get_table("account"))
 
     @property
     def assets(self) -> dict:
@@ -105,7 +292,7 @@ class GrapheneTrustlessClient:
         ~
         ["id", "fees_asset", "balance", "precision", "supply"]
         """
-        return ld2dd(self._get_table("assets"), key="name")
+        return self._format("assets", self._get_table("assets"))
 
     @property
     def objects(self) -> dict:
@@ -114,7 +301,7 @@ class GrapheneTrustlessClient:
         ~
         ["name", "precision"]
         """
-        return ld2dd(self._get_table("objects"), key="id")
+        return self._format("objects", self._get_table("objects"))
 
     @property
     def pairs(self) -> dict:
@@ -123,36 +310,69 @@ class GrapheneTrustlessClient:
         ~
         ["id", "last", "book", "history", "ops", "fills", "opens"]
         """
-        return ld2dd(self._get_table("pairs"), key="name")
+        return self._format("pairs", self._get_table("pairs"))
 
     @property
     def nodes(self) -> dict:
         """
         returns a dict of dicts of nodes keyed by websocket url; with subdict keys:
         ~
-        ["ping", "code", "status", "handshake"]
+        ["ping", "code", "status", "handshake", "blocktime",
+        "ewma_ping", "ewma_handshake", "error_rate", "timeout_rate", "minority_rate",
+        "sampled", "probed"]
         """
-        return ld2dd(self._get_table("nodes"), key="url")
+        return self._format("nodes", self._get_table("nodes"))
 
     @property
     def timing(self) -> dict:
         """
         returns a list of dicts of timing items, with keys:
         ~
-        ["ping", "read", "begin", "blocktime", "blocknum", "handshake"]
+        ["ping", "read", "begin", "blocktime", "blocknum", "handshake", "handover",
+        "warm", "contention"]
+        ~
+        handover is the sampling gap of the latest maven regeneration, in seconds
+        warm is None, else the oracle values are kept from a previous session and
+        those not yet recomputed were last written at unix time warm
+        contention is {process: {"locks", "lock_wait", "lock_max", "retries", "wait"}}
+        the seconds each writer waited to acquire the database write lock, see
+        Sql.transaction(); reported every CONTENTION_REPORT seconds, or None
         """
-        return self._get_table("timing")[0]
+        return self._format("timing", self._get_table("timing"))
 
     @property
     def whitelist(self) -> list:
         """
-        returns a dynamic list of node urls; tested and sorted by latency
+        returns a dynamic list of node urls; tested and sorted by score, best first
         ["wss://", "wss://", ...]
         """
         nodes = self._get_table("nodes")
         if len(nodes) > 1:
             nodes = [i for i in nodes if i["code"] == 200]
-            nodes = sorted(nodes, key=lambda d: d["ping"])
+            nodes = sorted(
+                nodes, key=lambda d: node_weight(d, self.constants), reverse=True
+            )
+        nodes = [i["url"] for i in nodes]
+        return nodes
+
+    @property
+    def sampled_whitelist(self) -> list:
+        """
+        returns the whitelist in weighted random order, see node_weight()
+        ["wss://", "wss://", ...]
+        ~
+        weighted sampling without replacement, key = random() ** (1 / weight)
+        fast reliable nodes tend to lead, yet every node is still sampled
+        so the mavens keep drawing independent samples for the oracle
+        """
+        nodes = self._get_table("nodes")
+        if len(nodes) > 1:
+            nodes = [i for i in nodes if i["code"] == 200]
+            nodes = sorted(
+                nodes,
+                key=lambda d: random() ** (1 / node_weight(d, self.constants)),
+                reverse=True,
+            )
         nodes = [i["url"] for i in nodes]
         return nodes
 
@@ -180,6 +400,7 @@ def unit_test():
         "pairs": metanode.pairs,
         "timing": metanode.timing,
         "whitelist": metanode.whitelist,
+        "sampled_whitelist": metanode.sampled_whitelist,
     }
     for name, method in methods.items():
         print(convert(name, "green"))
@@ -30,12 +30,15 @@ for decentralized exchange order book and user stream
 with collection procedures offering 99.9999% uptime
 """
 # STANDARD MODULES
+import asyncio
 import json
 import time
-from multiprocessing import Process, Value
-from random import choice, randint, shuffle
-from sqlite3 import OperationalError, connect
-from statistics import StatisticsError, median, mode, multimode
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing import Event, Process, Value
+from random import choice, randint, random
+from statistics import StatisticsError, median, multimode
 from threading import Thread
 from inspect import currentframe
 import sys
@@ -43,10 +46,27 @@ import os
 import psutil
 
 # GRAPHENE MODULES
+from .graphene_codec import is_encoded, loads
 from .graphene_constants import GrapheneConstants
 from .graphene_metanode_client import GrapheneTrustlessClient
-from .graphene_rpc import RemoteProcedureCall
-from .graphene_sql import SELECTS, Sql
+from .graphene_rpc import RemoteProcedureCall, RemoteProcedureSubscription
+from .graphene_scheduler import PAIR_TRACKERS, MavenScheduler
+from .graphene_shared import SharedWindows, maven_keys
+from .graphene_sql import (
+    MAVEN_DIGESTS_SELECT,
+    MAVEN_SOOTH_SELECT,
+    MAVEN_VERSIONS_SELECT,
+    MAVEN_WINDOW_SELECT,
+    NODE_LATENCY_UPDATE,
+    NODE_MINORITY_UPDATE,
+    NODE_RATES_UPDATE,
+    SELECTS,
+    STMT,
+    TRADES_EXPIRE,
+    TRADES_INSERT,
+    MavenBuffer,
+    Sql,
+)
 from .graphene_utils import (
     blip,
     invert_pairs,
@@ -102,6 +122,19 @@ class GrapheneMetanode:
         self.metanode = GrapheneTrustlessClient(self.constants)
         self.constants.metanode.BEGIN = time.time()
         self.sql = Sql(constants)
+        # shared memory maven windows, see MetanodeConfig.MAVEN_TRANSPORT
+        self.shared = None
+        # {node: unix of the latest head block poll} see maven_task rotation
+        self.polled = {}
+        # {node: (head block number, unix first seen)} at the last full maven cycle
+        self.heads = {}
+
+    def block_due(self, node) -> float:
+        """
+        seconds until the next head block of a node is expected, see MAVEN_BLOCK_GATE
+        """
+        seen = self.heads.get(node, (None, 0))[1]
+        return max(0, seen + self.constants.metanode.MAVEN_BLOCK_INTERVAL - time.time())
 
     def jprint_db(self):
         """
@@ -124,10 +157,24 @@ class GrapheneMetanode:
         signal_latency = Value("i", 0)
         signal_oracle = Value("i", 0)
         signal_maven = Value("i", 0)
-        maven_free = [Value("i", 1) for _ in range(self.constants.metanode.MAVENS)]
+        # set by mavens after every flush to wake the oracle
+        maven_bump = Event()
+        # the asyncio engine is a single maven process multiplexing every node
+        if self.constants.metanode.MAVEN_ENGINE == "asyncio":
+            mavens, maven_target = 1, self.maven_async_task
+        else:
+            mavens, maven_target = self.constants.metanode.MAVENS, self.maven_task
+        maven_free = [Value("i", 1) for _ in range(mavens)]
+        # time of the latest flush of each maven_id slot
+        maven_flushed = [Value("d", 0.0) for _ in range(mavens)]
         dinput("Press Enter to deploy database task")
-        self.sql.restart()
-        lprint(it("purple", "METANODE DATABASE INITIALIZED"))
+        # a warm start keeps the metadata, oracle values, and node scores on disk
+        warm = self.constants.metanode.WARM_START and self.sql.warm_start()
+        if warm:
+            lprint(it("purple", "METANODE DATABASE WARM STARTED"))
+        else:
+            self.sql.restart()
+            lprint(it("purple", "METANODE DATABASE INITIALIZED"))
         self.jprint_db()
         dinput("Press Enter to deploy latency task")
         self.jprint_db()
@@ -137,23 +184,40 @@ class GrapheneMetanode:
         latency_thread.start()
         self.jprint_db()
         dinput("Press Enter to deploy cache task")
-        self.cache_task()
+        if not warm:
+            self.cache_task()
         lprint(it("purple", "METANODE CACHE INITIALIZED"))
-        while not bool(signal_latency.value):
+        # warm; the mavens may begin with the whitelist of the last session
+        while not warm and not bool(signal_latency.value):
             time.sleep(1)
             continue
         lprint(it("purple", "METANODE LATENCY INITIALIZED"))
         self.jprint_db()
         dinput("Press Enter to deploy maven_id task")
-        maven_processes = {}
-        for maven_id in range(self.constants.metanode.MAVENS):
-            maven_processes[maven_id] = Process(
-                target=self.maven_task,
-                args=(signal_maven, maven_free[maven_id], maven_id),
+        if self.constants.metanode.MAVEN_TRANSPORT == "shared":
+            self.shared = SharedWindows(self.constants, create=True)
+            lprint(it("purple", "METANODE SHARED MEMORY INITIALIZED"))
+
+        def spawn(maven_id, free, flushed, warm=None):
+            """
+            start one maven process; a standby when given a warm Event
+            """
+            process = Process(
+                target=maven_target,
+                args=(signal_maven, free, maven_id, maven_bump, warm, flushed),
                 daemon=True,
             )
-            maven_processes[maven_id].name = f"hummingbot {self.constants.chain.NAME} metanode maven {maven_id}"
-            maven_processes[maven_id].start()
+            process.name = (
+                f"hummingbot {self.constants.chain.NAME} metanode maven {maven_id}"
+            )
+            process.start()
+            return process
+
+        maven_processes = {}
+        for maven_id in range(mavens):
+            maven_processes[maven_id] = spawn(
+                maven_id, maven_free[maven_id], maven_flushed[maven_id]
+            )
         self.jprint_db()
         lprint(it("purple", "METANODE MAVEN INITIALIZED"))
         dinput("Press Enter to deploy oracle task")
@@ -161,7 +225,7 @@ class GrapheneMetanode:
             blip(1)
             continue
         oracle_thread = Thread(
-            target=self.oracle_task, args=(signal_oracle, killswitch)
+            target=self.oracle_task, args=(signal_oracle, killswitch, maven_bump)
         )
         oracle_thread.start()
         while not bool(signal_oracle.value):
@@ -173,40 +237,86 @@ class GrapheneMetanode:
         lprint(stars + "\n    " + msg + "\n" + stars)
         self.initialized = True
         # maven regeneration
+        # a standby maven is spawned MAVEN_STANDBY_LEAD ahead, and once connected
+        # takes over the slot of the retiring maven the moment its last write drains
+        lead = self.constants.metanode.MAVEN_STANDBY_LEAD
+        drain = self.constants.metanode.MAVEN_DRAIN_JOIN
+        # {"id", "process", "free", "flushed", "warm"} of the standby maven
+        standby = None
+        # last flush of the retired maven, and the flush stamp of its standby
+        handover = None
+        # [(process, deadline), ...] retired mavens given time to exit cleanly
+        retiring = []
         iteration = 0
         while self.running_flag():
             iteration += 1
-            if iteration >= self.constants.metanode.REGENERATION_TUPLE:
-                iteration = 0
-                maven_id = randint(0, self.constants.metanode.MAVENS - 1)
-                # ##########################################################################
-                # SECURITY no maven_id task SQL access when dying
-                maven_free[maven_id].value = 0
-                time.sleep(1)
-                maven_processes[maven_id].terminate()
-                # ##########################################################################
-                maven_processes[maven_id] = Process(
-                    target=self.maven_task,
-                    args=(signal_maven, maven_free[maven_id], maven_id),
-                    daemon=True,
+            regeneration = self.constants.metanode.REGENERATION_TUPLE
+            if standby is None and iteration >= regeneration - lead:
+                maven_id = randint(0, mavens - 1)
+                standby = {
+                    "id": maven_id,
+                    "free": Value("i", 0),
+                    "flushed": Value("d", 0.0),
+                    "warm": Event(),
+                }
+                standby["process"] = spawn(
+                    maven_id, standby["free"], standby["flushed"], standby["warm"]
                 )
-                maven_processes[maven_id].name = f"hummingbot {self.constants.chain.NAME} metanode maven {maven_id}"
-                maven_processes[maven_id].start()
-                maven_free[maven_id].value = 1
+            if standby is not None and iteration >= regeneration:
+                if standby["warm"].is_set():
+                    iteration = 0
+                    maven_id = standby["id"]
+                    # ##################################################################
+                    # SECURITY no maven_id task SQL access when retired
+                    # the lock waits out a commit in progress, then the standby writes
+                    with maven_free[maven_id].get_lock():
+                        maven_free[maven_id].value = 0
+                    standby["free"].value = 1
+                    # ##################################################################
+                    handover = (
+                        maven_flushed[maven_id].value or time.time(),
+                        standby["flushed"],
+                    )
+                    retiring.append((maven_processes[maven_id], time.time() + drain))
+                    maven_processes[maven_id] = standby["process"]
+                    maven_free[maven_id] = standby["free"]
+                    maven_flushed[maven_id] = standby["flushed"]
+                    standby = None
+                elif not standby["process"].is_alive():
+                    # the standby died before it connected; spawn another
+                    standby = None
+            # report the time between the last write of the retired maven
+            # and the first write of its standby
+            if handover is not None and handover[1].value:
+                gap = float(precision(handover[1].value - handover[0], 4))
+                lprint(it("purple", "MAVEN HANDOVER GAP"), gap)
+                # ======================================================================
+                query = "UPDATE timing SET handover=?"
+                self.sql.execute(query, (gap,))  # DISCRETE SQL QUERY
+                # ======================================================================
+                handover = None
+            for process, deadline in list(retiring):
+                if not process.is_alive() or time.time() > deadline:
+                    process.terminate()
+                    retiring.remove((process, deadline))
             time.sleep(1)
         lprint(
-            f"{self.chain.NAME} Metanode signalled to shut down, killing all child processes...",
+            f"{self.constants.chain.NAME} Metanode signalled to shut down, killing all child processes...",
         )
         killswitch.value = 1
         for maven in maven_processes.values():
             maven.terminate()
+        if standby is not None:
+            standby["process"].terminate()
 
         for child in psutil.Process().children(recursive=True):
             child.terminate()
         for child in psutil.Process().children(recursive=True):
             child.wait()
+        if self.shared is not None:
+            self.shared.unlink()
         lprint(
-            f"All {self.chain.NAME} Metanode shutdown flags set & children killed.",
+            f"All {self.constants.chain.NAME} Metanode shutdown flags set & children killed.",
         )
 
     def running_flag(self):
@@ -227,20 +337,27 @@ class GrapheneMetanode:
         classify the response status of each node in the user configuration
         the aim here to determine if this is a legit public api endpoint
         ~
-        launch timed subprocesses to test each node in validated list
+        probe each node in validated list concurrently in a thread pool
         update the metanode with the latest connectivity data from the network
         ~
-        # threshers are Process to strictly enforce TIMEOUT
-        # Value is a multiprocessing communication channel
-        # we'll keep track of our values on this side in a status codes dict()
-        # the threshing processes will run concurrently on all nodes
+        # every probe shares one hard deadline, LATENCY_THRESHER_TIMEOUT
+        # the deadline bounds every handshake and socket timeout of the probe
+        # so the sweep ends as soon as every probe has resolved, or at the deadline
+        # a probe cut short by the deadline is a "CONNECTION TIMEOUT"
+        # all node rows are written in one transaction
+        # the moving average scores of each node are updated in the same transaction
         # repeat this process once per minute
+        ~
+        # the mavens measure ping and handshake of their own rpc calls, see maven_stats
+        # so thereafter only nodes without recent passive latency are probed
         """
 
-        def thresh(node, code, ping, handshake, blocktime):
+        def thresh(node, deadline):
             """
             ping the blockchain and return a response code to classify the interaction
+            :return dict(): code, ping, handshake, and blocktime of the node
             """
+            probe = {"code": 1008, "ping": 0, "handshake": 0, "blocktime": 0}
             try:
                 lprint(it("green", "latency"), it("blue", node))
                 # connect to websocket and capture handshake latency
@@ -248,27 +365,27 @@ class GrapheneMetanode:
                 # ======================================================================
                 # WSS START
                 # ======================================================================
-                rpc = RemoteProcedureCall(self.constants, [node])
-                handshake.value = time.time() - start
+                rpc = RemoteProcedureCall(self.constants, [node], deadline=deadline)
+                probe["handshake"] = time.time() - start
                 # get chain id and capture ping latency
                 start = time.time()
                 chain = rpc.chain_id()
-                ping.value = time.time() - start
+                probe["ping"] = time.time() - start
                 # get blocktime and participation rate (check if stale / forked)
-                blocktime.value, participation = rpc.blocktime_participation()
+                probe["blocktime"], participation = rpc.blocktime_participation()
                 if len(self.constants.chain.NODES) == 1 or (
                     "testnet" in self.constants.chain.NAME
                 ):  # skip participation tests on testnets or a single node in config
                     participation = 100
                 # calculate block latency
-                block_latency = time.time() - blocktime.value
+                block_latency = time.time() - probe["blocktime"]
                 try:
                     # check if this node supports history
                     rpc.market_history(self.constants.chain.PAIRS, depth=2)[
                         0
                     ]  # sample_pair?
                 except Exception:
-                    code.value = 1001  # "NO HISTORY"
+                    probe["code"] = 1001  # "NO HISTORY"
                 try:
                     # we're done testing this node for now... disconnect
                     rpc.close()
@@ -277,88 +394,121 @@ class GrapheneMetanode:
                     # ==================================================================
                 except Exception:
                     pass
-                if chain != self.constants.chain.ID:
-                    code.value = 1002  # "WRONG CHAIN ID"
+                if time.time() > deadline:
+                    probe["code"] = 1008  # "CONNECTION TIMEOUT"
+                elif chain != self.constants.chain.ID:
+                    probe["code"] = 1002  # "WRONG CHAIN ID"
                 elif participation < 90:  # @xeroc: anything above 67% is "fine"
-                    code.value = 1003  # "FORKED FROM MAINNET"
-                elif block_latency > (ping.value + 10):
-                    code.value = 1004  # "STALE BLOCKTIME",
-                elif handshake.value > 10:
-                    code.value = 1005  # "SLOW HANDSHAKE"
-                elif ping.value > self.constants.metanode.MAX_PING:
-                    code.value = 1006  # "SLOW PING"
+                    probe["code"] = 1003  # "FORKED FROM MAINNET"
+                elif block_latency > (probe["ping"] + 10):
+                    probe["code"] = 1004  # "STALE BLOCKTIME",
+                elif probe["handshake"] > 10:
+                    probe["code"] = 1005  # "SLOW HANDSHAKE"
+                elif probe["ping"] > self.constants.metanode.MAX_PING:
+                    probe["code"] = 1006  # "SLOW PING"
                 else:
-                    code.value = 200  # "CONNECTED"
+                    probe["code"] = 200  # "CONNECTED"
             except Exception as error:
-                code.value = 1007  # "CONNECTION FAILED"
+                probe["code"] = 1007  # "CONNECTION FAILED"
+                if time.time() > deadline:
+                    probe["code"] = 1008  # "CONNECTION TIMEOUT"
                 dprint(
                     str(node) + " " + str(type(error).__name__) + " " + str(error.args)
                 )
                 dprint(trace(error))
+            return probe
+
+        def unsampled():
+            """
+            nodes without recent passive latency, or without a recent probe
+            passive latency only spares the probe of a whitelisted node
+            """
+            now = time.time()
+            passive = self.constants.metanode.LATENCY_PASSIVE_WINDOW
+            active = self.constants.metanode.LATENCY_PROBE_MAX
+            # ==========================================================================
+            nodes = self.metanode.nodes  # DISCRETE SQL QUERY
+            # ==========================================================================
+            return [
+                node
+                for node in self.constants.chain.NODES
+                if node not in nodes
+                or nodes[node]["code"] != 200
+                or now - (nodes[node]["sampled"] or 0) > passive
+                or now - (nodes[node]["probed"] or 0) > active
+            ]
 
         nodes_to_test = list(self.constants.chain.NODES)
         # begin the latency task loop:
         while not killswitch.value:
             # initially test all nodes at once...
-            # then test each node with a pause in between thereafter
+            # then test one node lacking passive data with a pause in between
             if signal_latency.value:
-                nodes_to_test = [
-                    choice(self.constants.chain.NODES),
-                ]
+                try:
+                    nodes_to_test = unsampled()
+                except Exception as error:
+                    dprint(trace(error))
+                    nodes_to_test = list(self.constants.chain.NODES)
+                nodes_to_test = [choice(nodes_to_test)] if nodes_to_test else []
             # lprint(it("green", nodes_to_test))
             nodes = {}
-            codes = {}
-            handshakes = {}
-            pings = {}
-            blocktimes = {}
-            thresher = {}
             try:
-                for node_idx, node in enumerate(nodes_to_test):
-                    blip(0.5)
-                    codes[node] = Value("i", 1008)  # "CONNECTION TIMEOUT"
-                    pings[node] = Value("d", 0)
-                    handshakes[node] = Value("d", 0)  # "CONNECTION TIMEOUT"
-                    blocktimes[node] = Value("i", 0)  # unix blocktime
-                    # contacting the "unknown status" endpoint is Process wrapped
-                    thresher[node] = Process(
-                        target=thresh,
-                        args=(
-                            node,
-                            codes[node],
-                            pings[node],
-                            handshakes[node],
-                            blocktimes[node],
-                        ),
-                        daemon=True,
-                    )
-                    thresher[node].name = f"hummingbot {self.constants.chain.NAME} metanode latency thresher {node_idx}"
-                    # begin all the threshers at once
-                    thresher[node].start()
-                time.sleep(self.constants.metanode.LATENCY_THRESHER_TIMEOUT)
-                for node in nodes_to_test:
-                    try:
-                        thresher[node].terminate()
-                    except Exception as error:
-                        dprint(trace(error))
-                    status = self.constants.metanode.STATUS_CODES[codes[node].value]
+                timeout = self.constants.metanode.LATENCY_THRESHER_TIMEOUT
+                deadline = time.time() + timeout
+                # every probe ends by the deadline, so no thread outlives the sweep
+                with ThreadPoolExecutor(
+                    max_workers=max(1, len(nodes_to_test))
+                ) as executor:
+                    thresher = {
+                        node: executor.submit(thresh, node, deadline)
+                        for node in nodes_to_test
+                    }
+                for node, future in thresher.items():
+                    probe = future.result()
+                    status = self.constants.metanode.STATUS_CODES[probe["code"]]
                     if status != "CONNECTED":
-                        pings[node].value = 9999
-                        handshakes[node].value = 9999
+                        probe["ping"] = 9999
+                        probe["handshake"] = 9999
                     nodes[node] = {
-                        "ping": float(precision(pings[node].value, 4)),
-                        "handshake": float(precision(handshakes[node].value, 4)),
-                        "code": int(codes[node].value),
+                        "ping": float(precision(probe["ping"], 4)),
+                        "handshake": float(precision(probe["handshake"], 4)),
+                        "code": int(probe["code"]),
                         "status": status,
-                        "blocktime": int(blocktimes[node].value),
+                        "blocktime": int(probe["blocktime"]),
                     }
                 for node, values in nodes.items():
                     dprint(node, values)
                 node_updates = []
+                alpha = self.constants.metanode.NODE_EWMA
                 for node, state in nodes.items():
+                    node_updates.append(
+                        {
+                            "query": NODE_RATES_UPDATE,
+                            "values": {
+                                "alpha": alpha,
+                                "errors": float(state["code"] not in [200, 1008]),
+                                "timeouts": float(state["code"] == 1008),
+                                "url": node,
+                            },
+                        }
+                    )
+                    if state["code"] == 200:
+                        node_updates.append(
+                            {
+                                "query": NODE_LATENCY_UPDATE,
+                                "values": {
+                                    "alpha": alpha,
+                                    "ping": state["ping"],
+                                    "handshake": state["handshake"],
+                                    "url": node,
+                                },
+                            }
+                        )
                     node_updates.append(
                         {
                             "query": """UPDATE nodes
-                            SET ping=?, handshake=?, code=?, status=?, blocktime=?
+                            SET ping=?, handshake=?, code=?, status=?, blocktime=?,
+                            probed=?
                             WHERE url=?
                             """,
                             "values": (
@@ -367,12 +517,14 @@ class GrapheneMetanode:
                                 state["code"],
                                 state["status"],
                                 state["blocktime"],
+                                time.time(),
                                 node,
                             ),
                         }
                     )
                 # ======================================================================
-                self.sql.execute(node_updates)  # DISCRETE SQL QUERY
+                if node_updates:
+                    self.sql.execute(node_updates)  # DISCRETE SQL QUERY
                 # ======================================================================
             except Exception as error:
                 dprint(trace(error))
@@ -554,168 +706,16 @@ class GrapheneMetanode:
             else:
                 dprint("CACHE TASK RESTARTING")
 
-    def maven_task(self, signal_maven, maven_free, maven_id):
+    def maven_cycle(self, rpc, buffer, scheduler, subscription=None):
         """
-        gather streaming data and place it in a list to be statistically analyzed
+        one maven iteration of rpc calls against one connection, added to the buffer
+        shared by the process engine and every node of the asyncio engine
+        the scheduler picks which (tracker, row) jobs are served, see graphene_scheduler
+        a subscription notice makes the jobs of its market or account due at once
+        with MAVEN_BLOCK_GATE the chain is polled once per new head block per node
+        :return bool(): False if the node had no new block nor jobs left over,
+            and nothing was polled
         """
-
-        def maven_update(
-            self,
-            sooth,  # some value gathered from some tracker for some row
-            tracker,  # eg last, balances, book, fills, ops
-            row,  # database table primary key
-            maven_id,
-            maven_free,
-        ):
-            """
-            execute atomic sql read/edit/write to update the maven feed
-            """
-            # ~ lprint(
-            # ~ it("purple", "maven"),
-            # ~ tracker,
-            # ~ row,
-            # ~ )
-            if tracker == "fills" and not sooth:
-                return
-            # FIXME maven_id never gets used... its available for future dev
-            # ==========================================================================
-            # SECURITY - SQL INJECTION RISK at {tracker} and {table}
-            # hardcoded dict prevents injection at fstring
-            # ==========================================================================
-            table = self.constants.metanode.TRACKER_TABLE[tracker]
-            # ==========================================================================
-            # eg. SELECT last FROM maven_pairs WHERE name=BTC-USD
-            read_query = f"""SELECT {tracker} FROM maven_{table} WHERE name=?"""
-            read_values = (row,)
-            # eg. UPDATE pairs SET last=sooth WHERE name=BTC-USD
-            write_query = f"""UPDATE maven_{table} SET {tracker}=? WHERE name=?"""
-            # write_values are atomic
-            # maven_free.value is locked by parent process prior to Process termination
-            # this prevents a maven Process from hard kill while db is accessed
-            if maven_free.value:
-                # ======================================================================
-                # SQL CONNECT ** minimize access time **
-                # ======================================================================
-                if tracker in ["blocknum", "blocktime"]:
-                    con = connect(self.constants.chain.DATABASE)
-                    cur = con.cursor()
-                    cur.execute(read_query, read_values)
-                    curfetchall = cur.fetchall()
-                    pause = 0
-                    while True:
-                        pause += 1
-                        try:
-                            cur.execute(
-                                write_query,
-                                (
-                                    (
-                                        json.dumps(
-                                            (
-                                                json.loads(curfetchall[0][0])
-                                                + [sooth]
-                                            )[-mavens:]
-                                        )
-                                    ),
-                                    row,
-                                ),
-                            )
-                            break
-                        except OperationalError:
-                            dprint(
-                                "Race condition at",
-                                int(time.time()),
-                                "at line",
-                                get_linenumber(),
-                            )
-                            time.sleep(min(5, 1.01**pause - 1))
-                        except Exception as error:  # JSONDecodeError ?
-                            dprint(
-                                "maven error...",
-                                error.args,
-                                trace(error),
-                                table,
-                                tracker,
-                                row,
-                                sooth,
-                                maven_id,
-                                maven_free.value,
-                                curfetchall,
-                            )
-                            time.sleep(0.1)
-                else:
-                    pause = 0
-                    while True:
-                        pause += 1
-                        try:
-                            con = connect(self.constants.chain.DATABASE)
-                            cur = con.cursor()
-                            cur.execute(read_query, read_values)
-                            curfetchall = cur.fetchall()
-                            break
-                        except OperationalError:
-                            dprint(
-                                "Race condition at",
-                                int(time.time()),
-                                "at line",
-                                get_linenumber(),
-                            )
-                            time.sleep(min(5, 1.01**pause - 1))
-                    pause = 0
-                    while True:
-                        pause += 1
-                        try:
-                            cur.execute(
-                                write_query,
-                                (
-                                    (
-                                        json.dumps(
-                                            (
-                                                json.loads(curfetchall[0][0])
-                                                + [sooth]
-                                            )[-mavens:]
-                                        )
-                                    ),
-                                    row,
-                                ),
-                            )
-                            break
-                        except OperationalError:
-                            dprint(
-                                "Race condition at",
-                                int(time.time()),
-                                "at line",
-                                get_linenumber(),
-                            )
-                            time.sleep(min(5, 1.01**pause - 1))
-                        except Exception as error:  # JSONDecodeError ?
-                            dprint(
-                                "maven error...",
-                                error.args,
-                                trace(error),
-                                table,
-                                tracker,
-                                row,
-                                sooth,
-                                maven_id,
-                                maven_free.value,
-                                curfetchall,
-                            )
-                            time.sleep(0.1)
-                            #  pairs book TEST-ABC {'asks': [(1.1, 1.0)], 'bids': [(0.94999999, 1.0), (0.9, 1.0)]} 0 1
-                while True:
-                    try:
-                        con.commit()
-                        break
-                    except Exception:
-                        pass
-                con.close()
-                # ======================================================================
-                # SQL CLOSE
-                # ======================================================================
-
-        nodes = list(self.metanode.whitelist)
-        shuffle(nodes)
-        rpc = RemoteProcedureCall(self.constants, nodes or None)
         trackers = {
             "ltm": rpc.is_ltm,
             "fees_account": rpc.fees_account,
@@ -736,148 +736,353 @@ class GrapheneMetanode:
         assets = self.constants.chain.ASSETS
         account = self.constants.chain.ACCOUNT
         pause = self.constants.metanode.MAVEN_PAUSE
-        core_pairs = self.constants.chain.CORE_PAIRS
-        mavens = self.constants.metanode.MAVEN_WINDOW
-        rpc_ratio = self.constants.metanode.MAVEN_RPC_RATIO
-        high_low_ratio = self.constants.metanode.MAVEN_HIGH_LOW_RATIO
-        while True:
-            start = time.time()
-            _ = self.metanode.pairs
-            read_elapsed = time.time() - start
-            blip(pause)
-            maven_update(
-                self,
-                read_elapsed,
-                "read",
-                account,
-                maven_id,
-                maven_free,
+        # identical calls within this cycle are answered once by the node
+        rpc.begin_cycle()
+        # the oracle scores the node of every sooth by its votes
+        buffer.node = rpc.node
+        start = time.time()
+        _ = self.metanode.pairs
+        read_elapsed = time.time() - start
+        blip(pause)
+        buffer.add(read_elapsed, "read", account)
+        # notices since the last cycle
+        changed = subscription.take() if subscription is not None else set()
+        scheduler.expedite(
+            [(tracker, pair) for tracker in PAIR_TRACKERS for pair in changed]
+        )
+        if account in changed:
+            scheduler.expedite([(i, account) for i in ["ops", "opens", "balance"]])
+            # only the fills of markets whose assets are both named in the notice
+            ids = {k: v["id"] for k, v in self.metanode.assets.items()}  # SQL
+            scheduler.expedite(
+                [
+                    ("fills", pair)
+                    for pair in pairs
+                    if all(ids.get(i) in changed for i in pair.split("-"))
+                ]
             )
-            # create a fresh websocket every so many iterations
-            if int(signal_maven.value) % rpc_ratio == 0:
-                rpc = rpc.reconnect()  # WSS HANDSHAKE
-            #  low frequency
-            if int(signal_maven.value) % high_low_ratio == 0:
-                # account calls
-                for tracker in ["fees_account", "ltm"]:
-                    blip(pause)
-                    sooth = trackers[tracker]()  # WSS RPC
-                    maven_update(
-                        self,
-                        sooth,
-                        tracker,
-                        account,
-                        maven_id,
-                        maven_free,
-                    )
-                #  asset calls
-                for asset in assets:
-                    for tracker in ["supply", "fees_asset"]:
-                        blip(pause)
-                        sooth = trackers[tracker]()  # WSS RPC
-                        maven_update(
-                            self, sooth[asset], tracker, asset, maven_id, maven_free
-                        )
-            # high frequency
-            else:
-                # pair calls for account buy/sell/cancel operations and open orders
+        # chain data only changes with a block; the head is reused for blocknum
+        # the cycle is skipped only if no job is left over by the last budget either
+        if self.constants.metanode.MAVEN_BLOCK_GATE:
+            blip(pause)
+            head = rpc.block_number()  # WSS RPC
+            self.polled[rpc.node] = time.time()
+            if self.heads.get(rpc.node, (None,))[0] == head and not scheduler.pending():
+                rpc.end_cycle()
+                self.maven_stats(rpc, buffer)
+                return False
+            if self.heads.get(rpc.node, (None,))[0] != head:
+                self.heads[rpc.node] = (head, time.time())
+        if scheduler.cycles % self.constants.metanode.MAVEN_RECONCILE == 0:
+            # a full history fetch reconciles the incremental one
+            rpc.history = []
+            rpc.trades = {}
+            rpc.fills = {}
+        jobs = scheduler.select()
+        # pipeline every pair call of this cycle in about one round trip, then read
+        # them back without pacing; a failed prefetch leaves the calls to go live
+        pair_pause = pause
+        if self.constants.metanode.MAVEN_PIPELINE:
+            try:
+                rpc.prefetch(
+                    [
+                        rpc.query_params(tracker, row)
+                        for tracker, row in jobs
+                        if tracker in PAIR_TRACKERS
+                    ]
+                )
+                pair_pause = 0
+            except Exception as error:
+                dprint(trace(error))
+        for tracker, row in jobs:
+            sooth = None
+            try:
+                if tracker in PAIR_TRACKERS:
+                    #  NOTE the creation of each sooth from RPC is pair specific
+                    blip(pair_pause)
+                    sooth = trackers[tracker](row)  # WSS RPC
+                    buffer.add(sooth, tracker, row)
+                    # add the invert last price for every trading pair
+                    if tracker == "last":
+                        buffer.add(1 / sooth, "last", invert_pairs([row])[0])
+                    continue
+                blip(pause)
+                sooth = trackers[tracker]()  # WSS RPC
                 # NOTE the creation of sooth IS NOT pair specific; is keyed by pair
-                for tracker in ["ops", "opens"]:
-                    blip(pause)
-                    sooth = trackers[tracker]()
+                if tracker in ["ops", "opens"]:
                     # NOTE cancel operations carry no pair data; move to account table
                     if tracker == "ops":
-                        maven_update(
-                            self,
-                            sooth["cancels"],
-                            "cancels",
-                            account,
-                            maven_id,
-                            maven_free,
-                        )
+                        buffer.add(sooth["cancels"], "cancels", account)
+                    if tracker == "opens":
+                        scheduler.orders = {pair for pair in pairs if sooth[pair]}
                     for pair in pairs:
-                        maven_update(
-                            self, sooth[pair], tracker, pair, maven_id, maven_free
-                        )
-                #  pair calls for last, order book, fill orders, and market history
-                #  NOTE the creation if each sooth from RPC is pair specific
-                for tracker in ["last", "book", "fills", "history"]:
-                    for pair in pairs:
-                        try:
-                            blip(pause)
-                            sooth = trackers[tracker](pair)  # WSS RPC
-                            maven_update(
-                                self, sooth, tracker, pair, maven_id, maven_free
-                            )
-                        except Exception as error:
-                            dprint(trace(error))
-                        # add the invert last price for every trading pair
-                        if tracker == "last":
-                            try:
-                                blip(pause)
-                                sooth = trackers[tracker](pair)  # WSS RPC
-                                maven_update(
-                                    self,
-                                    1 / sooth,
-                                    "last",
-                                    invert_pairs([pair])[0],
-                                    maven_id,
-                                    maven_free,
-                                )
-                            except Exception as error:
-                                dprint(trace(error))
-                # add exchange rates back to core token for every asset
-                for pair in core_pairs:
-                    try:
-                        blip(pause)
-                        sooth = trackers["last"](pair)  # WSS RPC
-                        maven_update(self, sooth, "last", pair, maven_id, maven_free)
-                    except Exception as error:
-                        dprint(trace(error))
-                    # add the invert last price for every core trading pair
+                        buffer.add(sooth[pair], tracker, pair)
+                # NOTE one RPC and get a sooth keyed by asset
+                elif tracker in ["balance", "supply", "fees_asset"]:
+                    for asset in assets:
+                        buffer.add(sooth[asset], tracker, asset)
+                else:
+                    buffer.add(sooth, tracker, account)
+            except Exception as error:
+                dprint(trace(error))
+                sooth = None
+            finally:
+                scheduler.done((tracker, row), sooth)
+        rpc.end_cycle()
+        self.maven_stats(rpc, buffer)
+        return True
+
+    @staticmethod
+    def maven_stats(rpc, buffer):
+        """
+        move the rpc error and timeout counts, and the passive latency,
+        of each node into the buffer
+        """
+        for node, stats in rpc.take_stats().items():
+            buffer.rate(node, stats["calls"], stats["errors"], stats["timeouts"])
+            buffer.latency(node, stats["pings"], stats["handshakes"])
+
+    def maven_subscription(self, nodes):
+        """
+        a started subscription to the markets when MetanodeConfig.MAVEN_SUBSCRIBE,
+        and to the account when MAVEN_ACCOUNT_WATCH, else None
+        """
+        markets = self.constants.metanode.MAVEN_SUBSCRIBE
+        account = self.constants.metanode.MAVEN_ACCOUNT_WATCH
+        if not markets and not account:
+            return None
+        return RemoteProcedureSubscription(
+            self.constants,
+            nodes,
+            self.constants.chain.PAIRS + self.constants.chain.CORE_PAIRS
+            if markets
+            else [],
+            account,
+        ).start()
+
+    def maven_scheduler(self):
+        """
+        a tracker scheduler; trackers kept fresh by a subscription are polled less
+        """
+        subscribed = []
+        if self.constants.metanode.MAVEN_SUBSCRIBE:
+            subscribed += PAIR_TRACKERS
+        if self.constants.metanode.MAVEN_ACCOUNT_WATCH:
+            subscribed += ["ops", "opens", "balance", "fills"]
+        return MavenScheduler(self.constants, subscribed)
+
+    def maven_task(
+        self, signal_maven, maven_free, maven_id, maven_bump, warm=None, flushed=None
+    ):
+        """
+        gather streaming data and place it in a list to be statistically analyzed
+        ~
+        a standby maven is given a warm Event and maven_free 0; it connects, sets warm
+        and waits until deploy() hands it the maven_id slot of a retiring maven
+        a maven retires, and exits cleanly, once its maven_free is set back to 0
+        """
+        # every sooth of one iteration is flushed to the database in one transaction
+        buffer = MavenBuffer(self.constants, maven_free, maven_id, self.shared, flushed)
+        # weighted random by node score, see GrapheneTrustlessClient.sampled_whitelist
+        nodes = list(self.metanode.sampled_whitelist)
+        rpc = RemoteProcedureCall(self.constants, nodes or None)
+        subscription = self.maven_subscription(nodes or self.constants.chain.NODES)
+        scheduler = self.maven_scheduler()
+        # localize constants
+        pause = self.constants.metanode.MAVEN_PAUSE
+        rpc_ratio = self.constants.metanode.MAVEN_RPC_RATIO
+        block_interval = self.constants.metanode.MAVEN_BLOCK_INTERVAL
+        if warm is not None:
+            warm.set()
+            while not maven_free.value:
+                blip(pause)
+        # a standby takes over on the websocket it warmed up
+        fresh = True
+        while maven_free.value:
+            # create a fresh websocket every so many iterations
+            if int(signal_maven.value) % rpc_ratio == 0 and not fresh:
+                rpc = rpc.reconnect()  # WSS HANDSHAKE
+            fresh = False
+            if not self.maven_cycle(rpc, buffer, scheduler, subscription):
+                # this node is idle; the spare budget goes to node diversity
+                # rotate to a node not polled this block, else wait on this one
+                spare = [
+                    i
+                    for i in rpc.nodes
+                    if i != rpc.node
+                    and time.time() - self.polled.get(i, 0) >= block_interval
+                ]
+                if spare:
+                    rotated = spare + [i for i in rpc.nodes if i not in spare]
+                    rpc = rpc.reconnect(rotated)  # WSS HANDSHAKE
+                    fresh = True
+                else:
+                    time.sleep(self.block_due(rpc.node))
+            # ==========================================================================
+            buffer.flush()  # DISCRETE SQL QUERY
+            # ==========================================================================
+            maven_bump.set()
+            dprint(it("purple", "maven"), maven_id, "contention", self.sql.contention())
+            self.sql.report_contention(f"maven{maven_id}")
+            # return an iteration signal to the parent process
+            signal_maven.value += 1
+            blip(pause)
+        # retired; the maven_id slot now belongs to a standby maven
+        rpc.close()
+        if subscription is not None:
+            subscription.stop()
+
+    def maven_async_task(
+        self, signal_maven, maven_free, maven_id, maven_bump, warm=None, flushed=None
+    ):
+        """
+        the asyncio maven engine; see MetanodeConfig.MAVEN_ENGINE
+        one process and one event loop keep one websocket per whitelisted node
+        every node runs the same maven cycle concurrently with every other node
+        ~
+        websocket-client is blocking, so each node owns a single thread executor
+        the event loop only schedules; one node never waits on another
+        ~
+        as a standby, see maven_task, every node connects but none cycles
+        until maven_free is set; the process exits once maven_free is cleared again
+        """
+        # localize constants
+        nodes = self.constants.chain.NODES
+        pause = self.constants.metanode.MAVEN_PAUSE
+        rpc_ratio = self.constants.metanode.MAVEN_RPC_RATIO
+        refresh = self.constants.metanode.LATENCY_TASK_PAUSE
+        handshake = self.constants.signing.HANDSHAKE_TIMEOUT
+
+        async def node_task(node):
+            """
+            maven cycles against one node, into this node's own window slot
+            """
+            loop = asyncio.get_running_loop()
+            executor = ThreadPoolExecutor(max_workers=1)
+            buffer = MavenBuffer(
+                self.constants, maven_free, nodes.index(node), self.shared, flushed
+            )
+            subscription = self.maven_subscription([node])
+            scheduler = self.maven_scheduler()
+            rpc = None
+            iteration = 0
+            try:
+                while True:
                     try:
-                        blip(pause)
-                        sooth = trackers["last"](pair)  # WSS RPC
-                        maven_update(
-                            self,
-                            1 / sooth,
-                            "last",
-                            invert_pairs([pair])[0],
-                            maven_id,
-                            maven_free,
+                        if rpc is not None and not maven_free.value:
+                            # a standby, connected but not yet handed the slot
+                            await asyncio.sleep(pause)
+                            continue
+                        # create a fresh websocket every so many iterations
+                        if rpc is None or (iteration and iteration % rpc_ratio == 0):
+                            history, trades, fills = [], {}, {}
+                            if rpc is not None:
+                                rpc.close()
+                                history, trades = rpc.history, rpc.trades
+                                fills = rpc.fills
+                            # one handshake attempt, so a cancelled task never waits long
+                            rpc = await loop.run_in_executor(
+                                executor,
+                                partial(
+                                    RemoteProcedureCall,
+                                    self.constants,
+                                    [node],
+                                    deadline=time.time() + handshake,
+                                ),
+                            )  # WSS HANDSHAKE
+                            rpc.deadline = None
+                            rpc.history, rpc.trades = history, trades
+                            rpc.fills = fills
+                            if warm is not None:
+                                warm.set()
+                            if not maven_free.value:
+                                continue
+                        polled = await loop.run_in_executor(
+                            executor,
+                            self.maven_cycle,
+                            rpc,
+                            buffer,
+                            scheduler,
+                            subscription,
                         )
+                        if not polled:
+                            # this node is idle until the next block is due
+                            # meanwhile the loop serves the tasks of the other nodes
+                            await asyncio.sleep(self.block_due(node))
+                        # ==============================================================
+                        await loop.run_in_executor(executor, buffer.flush)
+                        # ==============================================================
+                        maven_bump.set()
+                        # return an iteration signal to the parent process
+                        signal_maven.value += 1
                     except Exception as error:
                         dprint(trace(error))
-                #  balances calls, NOTE one RPC and get a sooth keyed by asset
-                blip(pause)
-                sooth = trackers["balance"]()  # WSS RPC
-                for asset in self.constants.chain.ASSETS:
-                    maven_update(
-                        self, sooth[asset], "balance", asset, maven_id, maven_free
-                    )
-                # blocktime and blocknum calls in maven timing table
-                for tracker in ["blocktime", "blocknum"]:
-                    blip(pause)
-                    sooth = trackers[tracker]()  # WSS RPC
-                    # ~ lprint("maven " + tracker + ": " + it("red", str(sooth).upper()))
-                    maven_update(
-                        self,
-                        sooth,
-                        tracker,
-                        account,
-                        maven_id,
-                        maven_free,
+                        rpc = None
+                    iteration += 1
+                    await asyncio.sleep(pause * random())
+            finally:
+                if rpc is not None:
+                    # a call in flight raises at its next socket operation
+                    rpc.deadline = 0
+                    rpc.close()
+                if subscription is not None:
+                    subscription.stop()
+                # join the worker, which is bounded now; no thread outlives the task
+                await loop.run_in_executor(None, executor.shutdown)
+
+        async def supervisor():
+            """
+            keep one node task per whitelisted node as the whitelist changes
+            return once retired, cancelling every node task
+            """
+            tasks = {}
+            live = False
+            refreshed = 0
+            while True:
+                await asyncio.sleep(pause)
+                if maven_free.value:
+                    live = True
+                elif live:
+                    # retired; the slot now belongs to a standby maven
+                    for task in tasks.values():
+                        task.cancel()
+                    await asyncio.gather(*tasks.values(), return_exceptions=True)
+                    return
+                if time.time() - refreshed < refresh:
+                    continue
+                refreshed = time.time()
+                whitelist = [i for i in self.metanode.whitelist if i in nodes] or nodes
+                for node in list(tasks):
+                    if node not in whitelist:
+                        tasks.pop(node).cancel()
+                for node in whitelist:
+                    if node not in tasks:
+                        tasks[node] = asyncio.ensure_future(node_task(node))
+                dprint(
+                    it("purple", "maven"),
+                    maven_id,
+                    "asyncio nodes",
+                    len(tasks),
+                    "contention",
+                    self.sql.contention(),
+                )
+                if maven_free.value:
+                    # off the event loop; a busy database must not stall the nodes
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, self.sql.report_contention, f"maven{maven_id}"
                     )
-            # return an iteration signal to the parent process
-            signal_maven.value += 1
-            blip(pause)
 
-    def oracle_task(self, signal_oracle, killswitch):
+        asyncio.run(supervisor())
+
+    def oracle_task(self, signal_oracle, killswitch, maven_bump):
         """
         read maven tracker data from the database
         write statistical mode of the maven as the oracle back to database, eg.
         ~
-        pair["tracker"] = mode(maven_pairs["tracker"])
+        pair["tracker"] = mode(maven_samples["pairs"][pair]["tracker"])
+        ~
+        each window is recomputed only when its version has changed
+        maven_bump is set by the mavens after every flush to wake the oracle
         """
 
         def oracle_update(
@@ -887,289 +1092,209 @@ class GrapheneMetanode:
         ):
             """
             execute atomic sql read/edit/write to update the oracle feed
-            read table / row of maven_xyz, write statistical mode to xyz table / row
+            read the maven window of table / row / tracker
+            from maven_samples, or from shared memory when so configured
+            write statistical mode to xyz table / row
             """
             # ~ lprint(it("red", "oracle"), tracker, row)
             # ==========================================================================
-            # SECURITY SQL hardcoded dict prevents injection at fstring
+            # SECURITY SQL hardcoded dict; statements only come from the STMT registry
             # ==========================================================================
             table = self.constants.metanode.TRACKER_TABLE[tracker]
-            # ==========================================================================
-            # SQL CONNECT  ** minimize access time **
-            # ==========================================================================
-            con = connect(self.constants.chain.DATABASE)
-            cur = con.cursor()
-            # some timing tables require special consideration
-            if table == "timing" and tracker not in ["blocktime", "blocknum"]:
-                # update server time to current time.time()
-                if tracker == "server":
-                    pause = 0
-                    while True:
-                        pause += 1
-                        try:
-                            update_query = f"UPDATE timing SET server=?"
-                            update_values = (time.time(),)
-                            cur.execute(update_query, update_values)
-                            break
-                        except OperationalError:
-                            dprint(
-                                "Race condition at",
-                                int(time.time()),
-                                "at line",
-                                get_linenumber(),
-                            )
-                            time.sleep(min(5, 1.01**pause - 1))
-                        except Exception as error:
-                            dprint(trace(error))
-                # timing trackers which require median statistic
-                elif tracker == "read":
-                    pause = 1
-                    while True:
-                        try:
-                            select_query = f"""SELECT read FROM maven_timing"""
-                            select_values = tuple()
-                            update_query = f"""UPDATE timing SET read=?"""
-                            # update_values are atomic
-                            cur.execute(select_query, select_values)
-                            curfetchall = json.loads([i[0] for i in cur.fetchall()][0])
-                            cur.execute(
-                                update_query,
-                                ((float(precision(median(curfetchall), 6))),),
-                            )
-                            break
-                        except OperationalError:
-                            dprint(
-                                "Race condition at",
-                                int(time.time()),
-                                "at line",
-                                get_linenumber(),
-                            )
-                            time.sleep(min(5, 1.01**pause - 1))
-                            pause += 1
-                        except StatisticsError:
-                            dprint("Statistics Error during oracle /w tracker `read`")
-                            time.sleep(1)
-                        except Exception as error:
-                            dprint(trace(error))
-                # timing trackers which require median statistic
-                elif tracker in ["handshake", "ping"]:
-                    pause = 1
-                    while True:
-                        try:
-                            select_query = (
-                                f"""SELECT {tracker} FROM nodes WHERE code=200"""
-                            )
-                            select_values = tuple()
-                            update_query = f"""UPDATE timing SET {tracker}=?"""
-                            # update_values are atomic
-                            cur.execute(select_query, select_values)
-                            curfetchall = [i[0] for i in cur.fetchall()]
-                            cur.execute(
-                                update_query,
-                                ((float(precision(median(curfetchall), 4))),),
-                            )
-                            break
-                        except OperationalError:
-                            dprint(
-                                "Race condition at",
-                                int(time.time()),
-                                "at line",
-                                get_linenumber(),
-                            )
-                            time.sleep(min(5, 1.01**pause - 1))
-                            pause += 1
-                        except StatisticsError:
-                            dprint(
-                                f"Statistics Error during oracle /w tracker `{tracker}`"
-                            )
-                            time.sleep(1)
-                        except Exception as error:
-                            dprint(trace(error))
-            elif tracker == "cancels":
-                pause = 0
-                while True:
-                    pause += 1
-                    try:
-                        # the normal way of handling most tracker updates at oracle level
-                        select_query = (
-                            f"""SELECT {tracker} FROM maven_{table} WHERE name=?"""
-                        )
-                        select_values = (row,)
-                        update_query = (
-                            f"""UPDATE {table} SET {tracker}=? WHERE name=?"""
-                        )
-                        cur.execute(select_query, select_values)
-                        curfetchall = cur.fetchall()
-                        # ~ if tracker == "fills":
-                        # ~ lprint(cur.fetchall())
-                        break
-                    except OperationalError:
-                        dprint(
-                            "Race condition at",
-                            int(time.time()),
-                            "at line",
-                            get_linenumber(),
-                        )
-                        time.sleep(min(5, 1.01**pause - 1))
-                # update_values are atomic
-                pause = 0
-                while True:
-                    pause += 1
-                    try:
+
+            def window(cur):
+                """
+                json text of each sample in the maven window, oldest first
+                """
+                if self.shared is not None:
+                    return [i.decode() for i in self.shared.read(tracker, row)]
+                cur.execute(MAVEN_WINDOW_SELECT, (table, row, tracker))
+                return [i[0] for i in cur.fetchall()]
+
+            def consensus(cur):
+                """
+                json text of the statistical mode of the maven window
+                the mode is taken over content digests; ties go to the oldest sample
+                only the winning sample is ever copied out of the window
+                each sample not judged before is a vote for, or against, its node
+                """
+                if self.shared is not None:
+                    samples = self.shared.digests(tracker, row)
+                    if not samples:
+                        raise StatisticsError("no mode for empty data")
+                    winner = Counter(i[0] for i in samples).most_common(1)[0][0]
+                    seen = judged.setdefault((tracker, row), {})
+                    for sample_digest, slot, seq, node in samples:
+                        if seen.get(slot) != seq:
+                            seen[slot] = seq
+                            vote(node, sample_digest != winner)
+                    for sample_digest, slot, seq, _ in samples:
+                        if sample_digest == winner:
+                            payload = self.shared.payload(tracker, row, slot, seq)
+                            if payload is not None:
+                                # columnar binary is copied to the oracle as is
+                                if is_encoded(payload):
+                                    return payload
+                                return payload.decode()
+                    raise StatisticsError("maven window rewritten during read")
+                cur.execute(MAVEN_DIGESTS_SELECT, (table, row, tracker))
+                samples = cur.fetchall()
+                if not samples:
+                    raise StatisticsError("no mode for empty data")
+                winner = Counter(i[0] for i in samples).most_common(1)[0][0]
+                newest = judged.get((tracker, row), 0)
+                for sample_digest, node, version in samples:
+                    if version > newest:
+                        vote(node, sample_digest != winner)
+                judged[(tracker, row)] = samples[-1][2]
+                cur.execute(MAVEN_SOOTH_SELECT, (table, row, tracker, winner))
+                return cur.fetchall()[0][0]
+
+            def update(cur):
+                # some timing tables require special consideration
+                if table == "timing" and tracker not in ["blocktime", "blocknum"]:
+                    # update server time to current time.time()
+                    if tracker == "server":
+                        cur.execute(STMT.update_timing("server"), (time.time(),))
+                    # timing trackers which require median statistic
+                    elif tracker == "read":
+                        curfetchall = [json.loads(i) for i in window(cur)]
                         cur.execute(
-                            update_query,
-                            (
-                                json.dumps(
-                                    json.loads(
-                                        mode(
-                                            [
-                                                json.dumps(i)
-                                                for i in json.loads(
-                                                    curfetchall[0][0]
-                                                )
-                                            ]
-                                        )
-                                    )
-                                ),
-                                row,
-                            ),
-                        )
-                        break
-                    except OperationalError:
-                        dprint("Race Error", int(time.time()), tracker, table, row, curfetchall)
-                        time.sleep(min(5, 1.01**pause - 1))
-                    except StatisticsError:
-                        dprint("Statistics Error", tracker, table, row, curfetchall)
-                        break
-                    except IndexError:
-                        dprint("Index Error", tracker, table, row, curfetchall)
-                        break
-                    except Exception as error:
-                        dprint(trace(error), tracker, table, row, curfetchall)
-                        break
-            else:
-                pause = 0
-                while True:
-                    pause += 1
-                    try:
-                        # the normal way of handling most tracker updates at oracle level
-                        select_query = (
-                            f"""SELECT {tracker} FROM maven_{table} WHERE name=?"""
+                            STMT.update_timing("read"),
+                            ((float(precision(median(curfetchall), 6))),),
                         )
-                        select_values = (row,)
-                        update_query = (
-                            f"""UPDATE {table} SET {tracker}=? WHERE name=?"""
-                        )
-                        cur.execute(select_query, select_values)
-                        curfetchall = cur.fetchall()
-                        # ~ if tracker == "fills":
-                        # ~ lprint(cur.fetchall())
-                        break
-                    except OperationalError:
-                        dprint(
-                            "Race condition at",
-                            int(time.time()),
-                            "at line",
-                            get_linenumber(),
-                        )
-                        time.sleep(min(5, 1.01**pause - 1))
-                # update_values are atomic
-                pause = 0
-                while True:
-                    pause += 1
-                    try:
+                    # timing trackers which require median statistic
+                    elif tracker in ["handshake", "ping"]:
+                        cur.execute(STMT.select_nodes(tracker))
+                        curfetchall = [i[0] for i in cur.fetchall()]
                         cur.execute(
-                            update_query,
-                            (
-                                json.dumps(
-                                    json.loads(
-                                        mode(
-                                            [
-                                                json.dumps(i)
-                                                for i in json.loads(
-                                                    curfetchall[0][0]
-                                                )
-                                            ]
-                                        )
-                                    )
-                                ),
-                                row,
-                            ),
+                            STMT.update_timing(tracker),
+                            ((float(precision(median(curfetchall), 4))),),
                         )
-                        break
-                    except OperationalError:
-                        dprint("Race Error", int(time.time()), tracker, table, row, curfetchall)
-                        time.sleep(min(5, 1.01**pause - 1))
-                    except StatisticsError:
-                        dprint("Statistics Error", tracker, table, row, curfetchall)
-                        break
-                    except IndexError:
-                        dprint("Index Error", tracker, table, row, curfetchall)
-                        break
-                    except Exception as error:
-                        dprint(trace(error), tracker, table, row, curfetchall)
-                        break
-            while True:
-                try:
-                    con.commit()
-                    break
-                except Exception:
-                    pass
-            con.close()
+                # the normal way of handling most tracker updates at oracle level
+                else:
+                    sooth = consensus(cur)
+                    cur.execute(STMT.update_maven(table, tracker), (sooth, row))
+                    if tracker == "history":
+                        append_trades(cur, sooth)
+
+            def append_trades(cur, sooth):
+                """
+                append the trades of a history consensus to the trades table
+                then expire those past TRADES_RETENTION
+                """
+                if appended.get(row) == sooth:
+                    return
+                appended[row] = sooth
+                cur.executemany(
+                    TRADES_INSERT,
+                    [(row, i[4], i[0], i[1], i[2], i[3]) for i in loads(sooth)],
+                )
+                cur.execute(
+                    TRADES_EXPIRE,
+                    (row, time.time() - self.constants.metanode.TRADES_RETENTION),
+                )
+
+            # ==========================================================================
+            # SQL CONNECT  ** minimize access time **
+            # ==========================================================================
+            try:
+                self.sql.transaction(update)
+            except StatisticsError:
+                dprint("Statistics Error", tracker, table, row)
+            except IndexError:
+                dprint("Index Error", tracker, table, row)
+            except Exception as error:
+                dprint(trace(error), tracker, table, row)
             # ==========================================================================
             # SQL CLOSE
             # ==========================================================================
 
+        def maven_versions():
+            """
+            the current version of every maven window, keyed by (tracker, row)
+            """
+            if self.shared is not None:
+                return self.shared.versions()
+            return {
+                (i["tracker"], i["name"]): i["version"]
+                for i in self.sql.execute(MAVEN_VERSIONS_SELECT)
+            }
+
+        def vote(node, minority):
+            """
+            count one sample of a node, and whether it was outvoted
+            """
+            if node is not None:
+                tally = votes.setdefault(node, [0, 0])
+                tally[0] += 1
+                tally[1] += int(minority)
+
+        def score_nodes():
+            """
+            move the minority vote share of each node into its moving average
+            """
+            alpha = self.constants.metanode.NODE_EWMA
+            queries = [
+                {
+                    "query": NODE_MINORITY_UPDATE,
+                    "values": {
+                        "alpha": alpha,
+                        "minority": outvoted / cast,
+                        "url": node,
+                    },
+                }
+                for node, (cast, outvoted) in votes.items()
+            ]
+            votes.clear()
+            if queries:
+                try:
+                    self.sql.execute(queries)  # DISCRETE SQL QUERY
+                except Exception as error:
+                    dprint(trace(error))
+
         # localize constants
-        all_pairs = self.constants.chain.ALL_PAIRS
         oracle_pause = self.constants.metanode.ORACLE_PAUSE
         account = self.constants.chain.ACCOUNT
-        assets = self.constants.chain.ASSETS
-        pairs = self.constants.chain.PAIRS
+        keys = maven_keys(self.constants)
+        # the maven window version each (tracker, row) was last computed from
+        computed = {}
+        # the newest sample of each window already voted on
+        # {(tracker, row): version} in sqlite, {(tracker, row): {slot: seq}} in shared
+        judged = {}
+        # {node: [samples, outvoted samples]} since the last score_nodes()
+        votes = {}
+        # {pair: history consensus} last appended to the trades table
+        appended = {}
+        # oracle values kept by a warm start are aged until every window is recomputed
+        # fills windows are exempt; a pair without fills is never sampled
+        aged = True
         while not killswitch.value:
-            # low frequency
+            # wake as soon as any maven flushes, else after ORACLE_PAUSE
+            maven_bump.wait(oracle_pause)
+            maven_bump.clear()
+            # update server time on every pass
+            oracle_update(self, "server", account)
+            # low frequency; these are medians of the nodes table, not maven windows
             if int(signal_oracle.value) % 20 == 0:
-                # account writes
-                trackers = ["fees_account", "ltm"]
-                for tracker in trackers:
-                    blip(oracle_pause)
-                    oracle_update(self, tracker, account)
-                # asset writes
-                for asset in assets:
-                    trackers = ["supply", "fees_asset"]
-                    for tracker in trackers:
-                        blip(oracle_pause)
-                        oracle_update(self, tracker, asset)
-                # timing writes
                 for tracker in ["ping", "handshake"]:
-                    blip(oracle_pause)
-                    oracle_update(self, tracker, account)
-            # high frequency
-            else:
-                # updates to timing; these have no row key
-                trackers = ["server", "blocknum", "blocktime", "read"]
-                for tracker in trackers:
-                    blip(oracle_pause)
                     oracle_update(self, tracker, account)
-                # update account cancel operations; these are not split by pair
-                blip(oracle_pause)
-                oracle_update(self, "cancels", account)
-                # updates to each row in pair table
-                trackers = ["last", "book", "history", "fills", "opens", "ops"]
-                for pair in pairs:
-                    for tracker in trackers:
-                        blip(oracle_pause)
-                        oracle_update(self, tracker, pair)
-                # provide a last price for every asset back to core token
-                for pair in all_pairs:
-                    blip(oracle_pause)
-                    oracle_update(self, "last", pair)
-                # updates to each row in asset table
-                trackers = ["balance"]
-                for asset in assets:
-                    for tracker in trackers:
-                        blip(oracle_pause)
-                        oracle_update(self, tracker, asset)
+                score_nodes()
+            # skip every window no maven has written to since we last computed it
+            versions = maven_versions()
+            for tracker, row in keys:
+                version = versions.get((tracker, row))
+                if version is None or computed.get((tracker, row)) == version:
+                    continue
+                computed[(tracker, row)] = version
+                oracle_update(self, tracker, row)
+            if aged and all(i in computed for i in keys if i[0] != "fills"):
+                aged = False
+                # ======================================================================
+                self.sql.execute("UPDATE timing SET warm=NULL")  # DISCRETE SQL QUERY
+                # ======================================================================
+            dprint(it("purple", "oracle"), "contention", self.sql.contention())
+            self.sql.report_contention("oracle")
             # return an iteration signal to the parent process
             signal_oracle.value += 1
 
@@ -16,10 +16,12 @@ REMOTE PROCEDURE CALLS VIA PUBLIC NODE WEBSOCKET API
 """
 # STANDARD MODULES
 import json
+import math
 import threading
 import time
 import traceback
-from random import shuffle
+from concurrent.futures import Future
+from itertools import count
 
 # THIRD PARTY MODULES
 import websocket
@@ -41,6 +43,8 @@ from websocket import create_connection as wss_connect
 
 
 PROCESS_START = int(time.time() * 1000)
+# nodes which have refused a json-rpc batch array, per process
+BATCH_UNSUPPORTED = set()
 
 LOGO = """
 ╔═╗╦═╗╔═╗╔═╗╦ ╦╔═╗╔╗╔╔═╗  ╔╦╗╔═╗╔╦╗╔═╗╔╗╔╔═╗╔╦╗╔═╗
@@ -120,7 +124,7 @@ class RemoteProcedureSession:
     def on_close(self, *_):
         """Called when websocket connection is closed."""
         lprint(
-            f"Closing WebSocket connection",
+            "Closing WebSocket connection",
         )
         lprint(
             "last message:",
@@ -224,6 +228,161 @@ class RemoteProcedureSession:
         return data
 
 
+class RemoteProcedureSubscription(RemoteProcedureSession):
+    """
+    a persistent websocket app subscribed to markets, and optionally the account,
+    which flags the pairs and the account name as they change
+    ~
+    subscription = RemoteProcedureSubscription(constants, nodes, pairs, account)
+    subscription.start()
+    changed = subscription.take()  # flagged since the last take()
+    ~
+    everything is flagged at start and after any reconnect, as notices may be lost
+    """
+
+    # notice callback ids of markets are offset from the rpc request ids
+    CALLBACK = 1000
+
+    def __init__(self, constants, nodes, pairs, account=False):
+        super().__init__(list(nodes), -1)
+        self.constants = constants
+        self.pairs = list(pairs)
+        self.callbacks = {self.CALLBACK + idx: pair for idx, pair in enumerate(pairs)}
+        # the set_subscribe_callback id; account object notices arrive on it
+        self.account = constants.chain.ACCOUNT if account else None
+        self.pairs += [self.account] if account else []
+        self.dirty = set(self.pairs)
+        self.lock = threading.Lock()
+        self.run_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """
+        run the subscription in a daemon thread
+        """
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        """
+        stay subscribed, rotating through the nodes on every lost connection
+        """
+        while not self.run_event.is_set():
+            try:
+                self.wsa = websocket.WebSocketApp(
+                    self.nodes[0],
+                    on_message=self.on_message,
+                    on_error=self.on_error,
+                    on_close=self.on_close,
+                    on_open=self.on_open,
+                )
+                self.wsa.run_forever()
+            except Exception as error:
+                lprint(f"{str(error)}\n\n{traceback.format_exc()}")
+            # notices were missed while disconnected
+            self.mark(self.pairs)
+            self.nodes.append(self.nodes.pop(0))
+            self.run_event.wait(1)
+
+    def on_open(self, _):
+        """
+        start the keepalive, then subscribe to the account and every market
+        """
+        # one keepalive outlives reconnects, it pings whichever self.wsa is current
+        # it is started again only if a send to a closed socket ended it
+        if self.keepalive is None or not self.keepalive.is_alive():
+            self.keepalive = threading.Thread(target=self._ping, daemon=True)
+            self.keepalive.start()
+        messages = [["database", "set_subscribe_callback", [self.CALLBACK - 1, False]]]
+        if self.account is not None:
+            # subscribe=True; the node then notices changes to the account objects
+            messages.append(["database", "get_full_accounts", [[self.account], True]])
+        for callback, pair in self.callbacks.items():
+            asset, currency = pair.split("-")
+            messages.append(
+                ["database", "subscribe_to_market", [callback, currency, asset]]
+            )
+        for request_id, params in enumerate(messages, start=2):
+            self.wsa.send(
+                json.dumps(
+                    {
+                        "method": "call",
+                        "params": params,
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                    }
+                )
+            )
+
+    def on_message(self, _, reply):
+        """
+        flag the pair of every market notice, and the account on any notice of its
+        balances, orders, statistics or history, along with the asset ids the notice
+        names, eg. the pays and receives of a fill; responses are ignored
+        """
+        self.msg = str(reply)
+        try:
+            data = json.loads(reply, strict=False)
+        except ValueError:
+            return
+        if isinstance(data, dict) and data.get("method") == "notice":
+            callback = data["params"][0]
+            pair = self.callbacks.get(callback)
+            if pair is not None:
+                self.mark([pair])
+            elif callback == self.CALLBACK - 1 and self.account is not None:
+                # objects changed, or ids of objects removed; the keepalive
+                # subscribes its own block summary object 2.8.0, which is no news
+                ids = [
+                    i.get("id", "") if isinstance(i, dict) else str(i)
+                    for i in sum(data["params"][1], [])
+                ]
+                if any(not i.startswith("2.8.") for i in ids):
+                    self.mark([self.account] + sorted(self.named(data["params"][1])))
+
+    def named(self, notice) -> set:
+        """
+        :return set(): the asset ids named anywhere in the notice, but for its fees
+        """
+        if isinstance(notice, list):
+            return set().union(*[self.named(i) for i in notice])
+        if not isinstance(notice, dict):
+            return set()
+        assets = {
+            notice[key]
+            for key in ["asset_id", "asset_type"]
+            if isinstance(notice.get(key), str)
+        }
+        return assets.union(*[self.named(v) for k, v in notice.items() if k != "fee"])
+
+    def mark(self, pairs):
+        """
+        flag pairs as changed
+        """
+        with self.lock:
+            self.dirty.update(pairs)
+
+    def take(self) -> set:
+        """
+        :return set(): the pairs, account and asset ids flagged since the last take()
+            and clear them
+        """
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def stop(self):
+        """
+        unsubscribe by closing the websocket; the thread does not reconnect
+        """
+        self.run_event.set()
+        try:
+            self.wsa.close()
+        except Exception:
+            pass
+
+
 class RemoteProcedureCall:
     """
     query method docstrings are derived from Bitshare doxygen docs
@@ -232,15 +391,36 @@ class RemoteProcedureCall:
     and post processed python objects
     """
 
-    def __init__(self, constants, nodes=None, session=False):
+    def __init__(self, constants, nodes=None, session=False, deadline=None):
         self.constants = constants
         self.metanode = GrapheneTrustlessClient(self.constants)
         self.nodes = nodes
         self.printing = True
         self.connection = None
+        # the node of the current connection
+        self.node = None
+        # pipelined request ids; wss_query keeps its client_order_id
+        self.request_ids = count(2)
+        # {json params: [result, ...]} responses received ahead by prefetch()
+        self.prefetched = {}
+        # {json params: result} memoized for one maven cycle, None outside a cycle
+        self.cycle_cache = None
+        # the latest 100 raw account history operations, newest first, see operations()
+        self.history = []
+        # {(pair, depth): the latest raw market trades, newest first} see market_history()
+        self.trades = {}
+        # {pair: the latest 100 raw market fills, newest first} see fill_order_history()
+        self.fills = {}
+        # {node: {"calls": int, "errors": int, "timeouts": int,
+        #   "pings": [seconds, ...], "handshakes": [seconds, ...]}} until take_stats()
+        # the maven buffer sinks them into the nodes table, see MavenBuffer.latency()
+        self.stats = {}
+        # unix time after which every handshake and call raises TimeoutError, or None
+        # the socket timeouts shrink to fit, so a stuck call also ends at the deadline
+        self.deadline = deadline
         if nodes is None:
             # ==========================================================================
-            self.nodes = list(self.metanode.whitelist)  # DISCRETE SQL QUERY
+            self.nodes = list(self.metanode.sampled_whitelist)  # DISCRETE SQL QUERY
             # ==========================================================================
             # If there is no whitelist yet:
             if not self.nodes:
@@ -267,6 +447,7 @@ class RemoteProcedureCall:
         iteration = 0
         while handshake >= handshake_max and iteration < max(len(self.nodes) * 2, 10):
             iteration += 1
+            self.remaining(handshake_max)
             # attempt to close open stale connection
             try:
                 if self.connection is not None:
@@ -275,11 +456,19 @@ class RemoteProcedureCall:
                 pass
             try:
                 start = time.time()
-                self.connection = wss_connect(self.nodes[0], timeout=handshake_max)
+                self.connection = wss_connect(
+                    self.nodes[0], timeout=self.remaining(handshake_max)
+                )
+                self.node = self.nodes[0]
                 handshake = time.time() - start
-            except Exception:
+                self.node_stats(self.node)["handshakes"].append(handshake)
+            except Exception as error:
+                self.tally(self.nodes[0], error)
                 # ascending pause here prevents excess cpu on loss of internet
-                time.sleep(min(5, 1.01**iteration - 1))
+                try:
+                    time.sleep(self.remaining(min(5, 1.01**iteration - 1)))
+                except TimeoutError:
+                    pass
                 try:
                     self.connection.close()
                 except Exception:
@@ -288,11 +477,36 @@ class RemoteProcedureCall:
             self.nodes.append(self.nodes.pop(0))
         return self.connection
 
-    def wss_query(self, params: list = None, client_order_id: int = 1) -> object:
+    def remaining(self, timeout: float) -> float:
+        """
+        a socket timeout cut short to end no later than the deadline, if any
+        :raise TimeoutError: once the deadline has passed
+        """
+        if self.deadline is None:
+            return timeout
+        left = self.deadline - time.time()
+        if left <= 0:
+            raise TimeoutError("rpc deadline passed")
+        return min(timeout, left)
+
+    def wss_query(
+        self, params: list = None, client_order_id: int = 1, cache: bool = True
+    ) -> object:
         """
         this definition will place all remote procedure calls (RPC)
         the logo refresh is also here
+        cache=False always asks the node, eg. to retry a suspect response
         """
+        # params are ["api", "method", [args]]; identical calls share one response
+        key = json.dumps(params)
+        if cache and self.cycle_cache is not None and key in self.cycle_cache:
+            return self.cycle_cache[key]
+        # a response to these exact params was already received by prefetch()
+        if cache and self.prefetched.get(key):
+            result = self.prefetched[key].pop(0)
+            if self.cycle_cache is not None:
+                self.cycle_cache[key] = result
+            return result
         if self.printing:
             if not DEV:
                 lprint(
@@ -334,11 +548,23 @@ class RemoteProcedureCall:
                 )
                 # self.connection is the websocket connection created by wss_handshake()
                 # we will use this connection to send query and receive json
+                if self.deadline is not None:
+                    self.connection.settimeout(
+                        self.remaining(self.constants.signing.HANDSHAKE_TIMEOUT)
+                    )
+                start = time.time()
                 self.connection.send(query)
-                ret = json.loads(self.connection.recv())
+                ret = self.connection.recv()
+                ping = time.time() - start
+                ret = json.loads(ret)
                 try:
-                    return ret["result"]  # if there is result key take it
+                    result = ret["result"]  # if there is result key take it
+                    self.tally(self.node, ping=ping)
+                    if self.cycle_cache is not None:
+                        self.cycle_cache[key] = result
+                    return result
                 except Exception:
+                    self.tally(self.node, ret)
                     lprint(
                         "NODE FAILED",
                         jprint(params),
@@ -346,7 +572,9 @@ class RemoteProcedureCall:
                         ret,
                     )
                     return ret
-            except Exception:
+            except Exception as error:
+                # a timeout or a dropped socket counts against the node, see tally()
+                self.tally(self.node, error)
                 try:  # attempt to terminate the connection
                     self.connection.close()
                 except Exception:
@@ -358,6 +586,184 @@ class RemoteProcedureCall:
             client_order_id,
         )
 
+    def node_stats(self, node) -> dict:
+        """
+        the rpc statistics of one node since the last take_stats()
+        """
+        return self.stats.setdefault(
+            node,
+            {"calls": 0, "errors": 0, "timeouts": 0, "pings": [], "handshakes": []},
+        )
+
+    def tally(self, node, error=None, ping=None):
+        """
+        count one rpc call to a node, and whether it failed or timed out
+        :param error: None on success, else the exception or the error response
+        :param ping: the round trip of the call in seconds, if measured
+        """
+        stats = self.node_stats(node)
+        stats["calls"] += 1
+        if ping is not None:
+            stats["pings"].append(ping)
+        if isinstance(error, (websocket.WebSocketTimeoutException, TimeoutError)):
+            stats["timeouts"] += 1
+        elif error is not None:
+            stats["errors"] += 1
+
+    def take_stats(self) -> dict:
+        """
+        :return dict(): the rpc call counts by node since the last take_stats()
+        """
+        stats, self.stats = self.stats, {}
+        return stats
+
+    def begin_cycle(self):
+        """
+        memoize every response by params until end_cycle(); one maven iteration
+        """
+        self.cycle_cache = {}
+
+    def end_cycle(self):
+        """
+        forget the responses of this cycle, the next cycle asks the node again
+        """
+        self.cycle_cache = None
+        self.prefetched = {}
+
+    def wss_query_many(self, calls: list) -> list:
+        """
+        pipeline many remote procedure calls on one connection in about one round trip
+        ~
+        every request carries a distinct id; responses are matched back by id
+        the node may answer in any order; a json-rpc batch array is sent instead
+        where the node accepts them, else each request is sent as its own frame
+        ~
+        :param list(calls): [params, ...] as for wss_query()
+        :return list(): the result of each call, in the order of calls
+        """
+        if self.connection is None:
+            self.connection = self.wss_handshake()
+        results = [None] * len(calls)
+        remaining = list(range(len(calls)))
+        for _ in range(10):
+            # request id -> (index in calls, future)
+            pending = {next(self.request_ids): (idx, Future()) for idx in remaining}
+            requests = [
+                {"method": "call", "params": calls[idx], "jsonrpc": "2.0", "id": rid}
+                for rid, (idx, _) in pending.items()
+            ]
+            batch = self.node not in BATCH_UNSUPPORTED and len(requests) > 1
+            # the node answered the batch array with one error, or with no array
+            refused = False
+            try:
+                if self.deadline is not None:
+                    self.connection.settimeout(
+                        self.remaining(self.constants.signing.HANDSHAKE_TIMEOUT)
+                    )
+                if batch:
+                    self.connection.send(json.dumps(requests))
+                else:
+                    for request in requests:
+                        self.connection.send(json.dumps(request))
+                waiting = set(pending)
+                start = time.time()
+                ping = None
+                while waiting:
+                    ret = self.connection.recv()
+                    # the first response is one round trip; the rest are throughput
+                    ping = time.time() - start if ping is None else ping
+                    ret = json.loads(ret)
+                    # a node which does not accept batch arrays answers with one error
+                    if batch and not isinstance(ret, list):
+                        refused = True
+                        raise ValueError("json-rpc batch refused")
+                    for response in ret if isinstance(ret, list) else [ret]:
+                        # unknown ids are stale responses or notices
+                        if response.get("id") in waiting:
+                            waiting.discard(response["id"])
+                            pending[response["id"]][1].set_result(response)
+                for idx, future in pending.values():
+                    ret = future.result()
+                    # an error reply is no result; prefetch() skips it, wss_query() asks
+                    if "result" not in ret:
+                        lprint("NODE FAILED", jprint(calls[idx]), ret)
+                    results[idx] = ret.get("result")
+                    self.tally(self.node, None if "result" in ret else ret, ping)
+                    ping = None
+                return results
+            except Exception as error:
+                # refused; pipeline single frames to this node from now on
+                if refused:
+                    BATCH_UNSUPPORTED.add(self.node)
+                # else timed out or dropped; an ordinary failure, the batch is retried
+                self.tally(self.node, error)
+                # every response not yet matched is requested again, on a new socket
+                remaining = [i for i, future in pending.values() if not future.done()]
+                for idx, future in pending.values():
+                    if future.done():
+                        results[idx] = future.result().get("result")
+                try:
+                    self.connection.close()
+                except Exception:
+                    pass
+                self.connection = self.wss_handshake()
+        lprint("NODE FAILED AFTER 10 ATTEMPTS", len(remaining), "pipelined calls")
+        return results
+
+    def prefetch(self, calls: list):
+        """
+        pipeline calls now, so later wss_query() of identical params need no round trip
+        :param list(calls): [params, ...]; duplicate params are each answered once
+        """
+        self.prefetched = {}
+        for params, result in zip(calls, self.wss_query_many(calls)):
+            if result is not None:
+                self.prefetched.setdefault(json.dumps(params), []).append(result)
+
+    def query_params(self, tracker, pair, depth=None):
+        """
+        the exact rpc params of a pair tracker query, for prefetch() and the tracker
+        ~
+        :param str(tracker): one of last, book, history, fills
+        :param str(pair): trading pair
+        :param int(depth): book or history depth, else the tracker default
+        """
+        if tracker == "last":
+            asset, currency = pair.split("-")
+            return ["database", "get_ticker", [currency, asset, False]]
+        cache = self.get_pair_data(pair)
+        if tracker == "book":
+            return [
+                "database",
+                "get_order_book",
+                [cache["currency"]["name"], cache["asset"]["name"], depth or 3],
+            ]
+        if tracker == "history":
+            start, stop = self.history_window()
+            depth = depth or 100
+            # only the trades since the newest we hold, see market_history()
+            held = self.trades.get((pair, depth))
+            if held:
+                stop = max(stop, held[0]["date"])
+            return [
+                "database",
+                "get_trade_history",
+                [cache["currency"]["id"], cache["asset"]["id"], start, stop, depth],
+            ]
+        if tracker == "fills":
+            # only the newest few while we hold the latest, see fill_order_history()
+            limit = (
+                self.constants.metanode.MAVEN_FILLS_NEWER
+                if self.fills.get(pair)
+                else 100
+            )
+            return [
+                "history",
+                "get_fill_order_history",
+                [cache["asset"]["id"], cache["currency"]["id"], limit],
+            ]
+        raise ValueError(f"no params builder for tracker {tracker}")
+
     def close(self):
         """
         attempt to close the websocket connection associated with this instance
@@ -367,14 +773,18 @@ class RemoteProcedureCall:
         except Exception:
             pass
 
-    def reconnect(self):
+    def reconnect(self, nodes=None):
         """
         close and reopen the connection
+        :param list(nodes): in order of preference, else the sampled whitelist
         """
         self.close()
-        nodes = list(self.metanode.whitelist)
-        shuffle(nodes)
-        return RemoteProcedureCall(self.constants, nodes)
+        rpc = RemoteProcedureCall(self.constants, nodes)
+        rpc.history = self.history
+        rpc.trades = self.trades
+        rpc.fills = self.fills
+        rpc.stats = self.take_stats()
+        return rpc
 
     def get_pair_data(self, pair):
         """
@@ -421,8 +831,8 @@ class RemoteProcedureCall:
         :RPC returns: Balances of the account
         """
         # ==============================================================================
-        dict_assets = dict(self.metanode.assets)  # DISCRETE SQL QUERY
-        metanode_objects = dict(self.metanode.objects)  # DISCRETE SQL QUERY
+        view = self.metanode.snapshot(["assets", "objects"])  # SQL SNAPSHOT
+        dict_assets, metanode_objects = dict(view["assets"]), view["objects"]
         # ==============================================================================
         list_assets = list(dict_assets.keys())
         balances = {asset: {"free": 0, "tied": 0, "total": 0} for asset in list_assets}
@@ -520,13 +930,7 @@ class RemoteProcedureCall:
         :RPC returns: Order book of the market
         """
         cache = self.get_pair_data(pair)
-        order_book = self.wss_query(
-            [
-                "database",
-                "get_order_book",
-                [cache["currency"]["name"], cache["asset"]["name"], depth],
-            ],
-        )
+        order_book = self.wss_query(self.query_params("book", pair, depth))
         asks = []
         bids = []
         for i, _ in enumerate(order_book["asks"]):
@@ -658,8 +1062,7 @@ class RemoteProcedureCall:
         :RPC param quote: symbol name or ID of the quote asset
         :RPC returns: The market ticker for the past 24 hours
         """
-        asset, currency = pair.split("-")
-        ticker = self.wss_query(["database", "get_ticker", [currency, asset, False]])
+        ticker = self.wss_query(self.query_params("last", pair))
         last = float(precision(ticker["latest"], 16))
         if float(last) == 0:
             last = -1
@@ -667,6 +1070,16 @@ class RemoteProcedureCall:
         #     raise ValueError("zero price last")
         return last
 
+    @staticmethod
+    def history_window() -> tuple:
+        """
+        iso (start, stop) of the 24 hour market history window
+        quantized so a prefetch and the tracker call a moment later agree
+        rounded up; the start of the window may be in the future, never stale
+        """
+        now = math.ceil(time.time() / 60) * 60
+        return to_iso_date(now), to_iso_date(now - 86400)
+
     def market_history(self, pair, depth=100):
         """
         RPC recent recent transaction in this market
@@ -676,22 +1089,25 @@ class RemoteProcedureCall:
         :RPC param int(start):  Start time UNIX timestamp; latest transactions to get
         :RPC param int(stop):  Stop time UNIX timestamp; earliest transactions to get
         :RPC param int(limit):  Maximum quantity of transactions to retrieve, max 100
+        ~
+        the raw trades are kept in self.trades; while it holds any for the pair, only
+        trades since the newest are fetched and merged in front
+        clear self.trades to fetch the whole window again
+        either way the sooth is the latest depth trades of the 24 hour window
         """
-        cache = self.get_pair_data(pair)
-        now = time.time()
-        trade_history = self.wss_query(
-            [
-                "database",
-                "get_trade_history",
-                [
-                    cache["currency"]["id"],
-                    cache["asset"]["id"],
-                    to_iso_date(now),
-                    to_iso_date(now - 86400),
-                    depth,
-                ],
-            ],
-        )
+        trade_history = self.wss_query(self.query_params("history", pair, depth))
+        held = self.trades.get((pair, depth), [])
+        sequences = {i["sequence"] for i in trade_history}
+        trade_history = trade_history + [
+            i for i in held if i["sequence"] not in sequences
+        ]
+        stop = self.history_window()[1]
+        trade_history = sorted(
+            [i for i in trade_history if i["date"] >= stop],
+            key=lambda i: (i["date"], i["sequence"]),
+            reverse=True,
+        )[:depth]
+        self.trades[(pair, depth)] = trade_history
         history = []
         # ~ lprint(trade_history, )
         # ~ [{'sequence': 183490,
@@ -723,9 +1139,7 @@ class RemoteProcedureCall:
         metanode_objects = dict(self.metanode.objects)  # DISCRETE SQL QUERY
         metanode_assets = dict(self.metanode.assets)  # DISCRETE SQL QUERY
         # ==============================================================================
-        ret = self.wss_query(
-            ["database", "get_full_accounts", [[account_name], "false"]]
-        )
+        ret = self.wss_query(["database", "get_full_accounts", [[account_name], False]])
         try:
             limit_orders = ret[0][1]["limit_orders"]
         except Exception:
@@ -820,7 +1234,7 @@ class RemoteProcedureCall:
             [
                 "database",
                 "get_full_accounts",
-                [[self.constants.chain.ACCOUNT], "false"],
+                [[self.constants.chain.ACCOUNT], False],
             ],
         )
         try:
@@ -922,9 +1336,13 @@ class RemoteProcedureCall:
         :RPC param asset_b: The other asset symbol or ID in the trading pair
         :RPC param limit: Maximum records to return
         :RPC returns: a list of order_history objects, in "most recent first" order
+        ~
+        the raw fills are kept in self.fills; while it holds any for the pair, only
+        the newest MAVEN_FILLS_NEWER are fetched and merged in front, unless none of
+        them is held yet, then the whole 100 are fetched again to close the gap
+        clear self.fills to fetch the whole 100 again
         """
         # ==============================================================================
-        pair_data = self.get_pair_data(pair)  # DISCRETE SQL QUERY
         objects = dict(self.metanode.objects)  # DISCRETE SQL QUERY
         account_id = str(self.metanode.account["id"])  # DISCRETE SQL QUERY
         pairs = dict(self.metanode.pairs)  # DISCRETE SQL QUERY
@@ -936,13 +1354,17 @@ class RemoteProcedureCall:
             iteration += 1
             if iteration > 10:
                 break
-            ret = self.wss_query(
-                [
-                    "history",
-                    "get_fill_order_history",
-                    [pair_data["asset"]["id"], pair_data["currency"]["id"], 100],
-                ],
-            )
+            # retries ask the node again rather than reuse the first response
+            ret = self.wss_query(self.query_params("fills", pair), cache=iteration == 1)
+            held = self.fills.get(pair, [])
+            sequences = {i["key"]["sequence"] for i in ret}
+            if held and ret and not sequences & {i["key"]["sequence"] for i in held}:
+                self.fills[pair] = held = []
+                ret = self.wss_query(self.query_params("fills", pair))
+                sequences = {i["key"]["sequence"] for i in ret}
+            ret = ret + [i for i in held if i["key"]["sequence"] not in sequences]
+            ret = ret[:100]
+            self.fills[pair] = ret
             # sort by user
             fills = [i for i in ret if i["op"]["account_id"] == account_id]
             for fill in fills:
@@ -1070,6 +1492,10 @@ class RemoteProcedureCall:
         :RPC param int(start):  Sequence number of the most recent operation to retrieve
             0 is default, which will start querying from the most recent operation
         :RPC returns:  A list of operations performed by account; recent to oldest
+        ~
+        the raw operations are kept in self.history; while it holds any, only newer
+        operations are fetched, by get_account_history, and merged in front
+        clear self.history to fetch all 100 again
         """
         # gather cache required to post process relative history from the metanode
         # ==============================================================================
@@ -1078,18 +1504,31 @@ class RemoteProcedureCall:
         account_name = self.constants.chain.ACCOUNT
         trading_pairs = self.constants.chain.PAIRS
         # make the external call
-        ret = self.wss_query(
-            [
-                "history",
-                "get_relative_account_history",
+        if self.history:
+            # only the operations newer than the latest we hold
+            ret = self.wss_query(
                 [
-                    account_name,
-                    0,  # total_ops - 100,
-                    100,
-                    0,  # total_ops,
+                    "history",
+                    "get_account_history",
+                    [account_name, self.history[0]["id"], 100, "1.11.0"],
                 ],
-            ],
-        )
+            )
+            ids = {i["id"] for i in ret}
+            ret = (ret + [i for i in self.history if i["id"] not in ids])[:100]
+        else:
+            ret = self.wss_query(
+                [
+                    "history",
+                    "get_relative_account_history",
+                    [
+                        account_name,
+                        0,  # total_ops - 100,
+                        100,
+                        0,  # total_ops,
+                    ],
+                ],
+            )
+        self.history = ret
         # ==============================================================================
         # OP 1 - LIMIT ORDER CREATE
         # ==============================================================================
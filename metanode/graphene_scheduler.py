@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# DISABLE SELECT PYLINT TESTS
+# pylint: disable=bad-continuation
+r"""
+ ╔════════════════════════════════════════════════════╗
+ ║ ╔═╗╦═╗╔═╗╔═╗╦ ╦╔═╗╔╗╔╔═╗  ╔╦╗╔═╗╔╦╗╔═╗╔╗╔╔═╗╔╦╗╔═╗ ║
+ ║ ║ ╦╠╦╝╠═╣╠═╝╠═╣║╣ ║║║║╣   ║║║║╣  ║ ╠═╣║║║║ ║ ║║║╣  ║
+ ║ ╚═╝╩╚═╩ ╩╩  ╩ ╩╚═╝╝╚╝╚═╝  ╩ ╩╚═╝ ╩ ╩ ╩╝╚╝╚═╝═╩╝╚═╝ ║
+ ╚════════════════════════════════════════════════════╝
+~
+MAVEN TRACKER SCHEDULER
+~
+every maven job is a (tracker, row) with a refresh interval and a priority
+see MetanodeConfig.MAVEN_SCHEDULE
+each cycle the jobs past due are served, most urgent first, up to MAVEN_BUDGET
+~
+urgency = priority + lateness in intervals + boosts
+    lateness grows without bound, so no due job starves
+    pairs holding our open orders, and jobs whose sooth changed, are boosted
+"""
+# STANDARD MODULES
+import time
+
+# GRAPHENE MODULES
+from .graphene_utils import canonical, digest
+
+# trackers queried per pair; every other tracker is one call for the account
+PAIR_TRACKERS = ["last", "book", "fills", "history"]
+
+
+def maven_jobs(constants) -> list:
+    """
+    every (tracker, row) job of one maven, rows of account wide calls are the account
+    """
+    account = constants.chain.ACCOUNT
+    jobs = []
+    for tracker in ["ops", "opens", "balance", "blocknum", "blocktime"]:
+        jobs.append((tracker, account))
+    for pair in constants.chain.PAIRS:
+        for tracker in PAIR_TRACKERS:
+            jobs.append((tracker, pair))
+    # exchange rates back to the core token
+    for pair in constants.chain.CORE_PAIRS:
+        jobs.append(("last", pair))
+    for tracker in ["fees_account", "ltm", "supply", "fees_asset"]:
+        jobs.append((tracker, account))
+    return jobs
+
+
+class MavenScheduler:
+    """
+    deadline scheduler of one maven's jobs
+    ~
+    scheduler = MavenScheduler(constants, subscribed)
+    for job in scheduler.select():
+        scheduler.done(job, sooth)  # or sooth=None on failure
+    ~
+    subscribed trackers are kept fresh by notices and scheduler.expedite()
+    so their interval is stretched MAVEN_RECONCILE fold
+    """
+
+    def __init__(self, constants, subscribed=()):
+        self.constants = constants
+        self.schedule = constants.metanode.MAVEN_SCHEDULE
+        self.budget = constants.metanode.MAVEN_BUDGET
+        self.boosts = constants.metanode.MAVEN_BOOSTS
+        self.reconcile = constants.metanode.MAVEN_RECONCILE
+        self.subscribed = set(subscribed)
+        # every job is due at once
+        now = time.time()
+        self.due = {job: now for job in maven_jobs(constants)}
+        self.digests = {}
+        # jobs whose sooth differed from the one before
+        self.changed = set()
+        # pairs holding open orders of the account
+        self.orders = set()
+        # jobs due, but left over by the budget of the last cycle or expedited since
+        self.backlog = set()
+        self.cycles = 0
+
+    def interval(self, job) -> float:
+        """
+        seconds between refreshes of a job
+        """
+        interval = self.schedule[job[0]][0]
+        if job[0] in self.subscribed:
+            interval *= self.reconcile
+        return interval
+
+    def urgency(self, job, now) -> float:
+        """
+        priority, plus intervals overdue, plus boosts
+        """
+        urgency = self.schedule[job[0]][1]
+        urgency += (now - self.due[job]) / self.interval(job)
+        if job[1] in self.orders:
+            urgency += self.boosts["orders"]
+        if job in self.changed:
+            urgency += self.boosts["changed"]
+        return urgency
+
+    def select(self) -> list:
+        """
+        :return list(): the jobs to serve this cycle, most urgent first
+        """
+        self.cycles += 1
+        now = time.time()
+        due = [job for job, deadline in self.due.items() if deadline <= now]
+        due.sort(key=lambda job: self.urgency(job, now), reverse=True)
+        self.backlog = set(due[self.budget :])
+        return due[: self.budget]
+
+    def pending(self) -> bool:
+        """
+        True if jobs are left over from the last cycle, or expedited since
+        """
+        return bool(self.backlog)
+
+    def expedite(self, jobs):
+        """
+        make jobs due now, eg. on a subscription notice
+        """
+        now = time.time()
+        for job in jobs:
+            if job in self.due:
+                self.due[job] = min(self.due[job], now)
+                self.backlog.add(job)
+
+    def done(self, job, sooth=None):
+        """
+        reschedule a served job; sooth None when the job failed
+        """
+        self.due[job] = time.time() + self.interval(job)
+        self.backlog.discard(job)
+        if sooth is None:
+            return
+        sooth_digest = digest(canonical(sooth))
+        if self.digests.get(job, sooth_digest) != sooth_digest:
+            self.changed.add(job)
+        else:
+            self.changed.discard(job)
+        self.digests[job] = sooth_digest
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# DISABLE SELECT PYLINT TESTS
+# pylint: disable=bad-continuation, broad-except
+r"""
+ ╔════════════════════════════════════════════════════╗
+ ║ ╔═╗╦═╗╔═╗╔═╗╦ ╦╔═╗╔╗╔╔═╗  ╔╦╗╔═╗╔╦╗╔═╗╔╗╔╔═╗╔╦╗╔═╗ ║
+ ║ ║ ╦╠╦╝╠═╣╠═╝╠═╣║╣ ║║║║╣   ║║║║╣  ║ ╠═╣║║║║ ║ ║║║╣  ║
+ ║ ╚═╝╩╚═╩ ╩╩  ╩ ╩╚═╝╝╚╝╚═╝  ╩ ╩╚═╝ ╩ ╩ ╩╝╚╝╚═╝═╩╝╚═╝ ║
+ ╚════════════════════════════════════════════════════╝
+~
+SHARED MEMORY MAVEN WINDOWS
+~
+an optional maven -> oracle transport which bypasses the sqlite database
+one fixed size slot ring per (tracker, row), one slot per maven
+each maven (process, or node of the asyncio engine) is the only writer
+of its own slot in every ring
+the oracle reads the rings lock free
+~
+every slot is guarded by a sequence counter, eg. a seqlock:
+    odd while a maven is writing, even when the slot is consistent
+a maven terminated mid write leaves its slot odd and the oracle ignores it
+a read which races a write sees the counter change and is discarded
+"""
+# STANDARD MODULES
+from multiprocessing import shared_memory
+from struct import calcsize, pack_into, unpack_from
+
+# slot header; sequence counter, payload length, 16 byte content digest,
+# and the index in chain.NODES of the node the payload came from
+HEADER = "<QI16sH"
+NO_NODE = 0xFFFF
+HEADER_SIZE = calcsize(HEADER)
+
+
+def maven_keys(constants) -> list:
+    """
+    every (tracker, row) a maven may write, in a stable order
+    """
+    account = constants.chain.ACCOUNT
+    keys = []
+    for tracker in ["fees_account", "ltm", "cancels", "read", "blocknum", "blocktime"]:
+        keys.append((tracker, account))
+    for asset in constants.chain.ASSETS:
+        for tracker in ["supply", "fees_asset", "balance"]:
+            keys.append((tracker, asset))
+    for pair in constants.chain.PAIRS:
+        for tracker in ["ops", "book", "history", "opens", "fills"]:
+            keys.append((tracker, pair))
+    for pair in constants.chain.ALL_PAIRS:
+        keys.append(("last", pair))
+    return keys
+
+
+def maven_slots(constants) -> int:
+    """
+    slots per ring; one per maven process, or one per node for the asyncio engine
+    """
+    if constants.metanode.MAVEN_ENGINE == "asyncio":
+        return max(constants.metanode.MAVENS, len(constants.chain.NODES))
+    return constants.metanode.MAVENS
+
+
+class SharedWindows:
+    """
+    maven windows in one block of shared memory
+    ~
+    parent:  shared = SharedWindows(constants, create=True)
+    maven:   shared.write(tracker, row, maven_id, payload, digest, node)
+    oracle:  shared.digests(tracker, row) then shared.payload(...) for the mode
+    oracle:  shared.read(tracker, row) when every payload is needed
+    parent:  shared.unlink()
+    ~
+    the object is inherited by forked mavens, or pickled by name when spawned
+    """
+
+    def __init__(self, constants, create=False, name=None):
+        self.constants = constants
+        self.slots = maven_slots(constants)
+        slot_bytes = constants.metanode.SHARED_SLOT_BYTES
+        # (tracker, row) -> [(offset, size), ...] one per slot
+        self.offsets = {}
+        total = 0
+        for tracker, row in maven_keys(constants):
+            size = slot_bytes.get(tracker, slot_bytes["default"])
+            self.offsets[(tracker, row)] = []
+            for _ in range(self.slots):
+                self.offsets[(tracker, row)].append((total, size))
+                total += HEADER_SIZE + size
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=total)
+        if create:
+            self.shm.buf[:total] = bytes(total)
+
+    def __reduce__(self):
+        return (self.__class__, (self.constants, False, self.shm.name))
+
+    def write(
+        self, tracker, row, slot, payload: bytes, digest=bytes(16), node=None
+    ) -> bool:
+        """
+        write one sooth payload to this maven's slot of the (tracker, row) ring
+        :return bool(): False if the key is unknown or the payload is oversize
+        """
+        try:
+            offset, size = self.offsets[(tracker, row)][slot]
+        except (KeyError, IndexError):
+            return False
+        if len(payload) > size:
+            return False
+        buf = self.shm.buf
+        seq = unpack_from("<Q", buf, offset)[0]
+        # a previous writer of this slot was terminated mid write
+        seq += seq % 2
+        nodes = self.constants.chain.NODES
+        node = nodes.index(node) if node in nodes else NO_NODE
+        # odd; write in progress
+        pack_into(HEADER, buf, offset, seq + 1, len(payload), digest, node)
+        start = offset + HEADER_SIZE
+        buf[start : start + len(payload)] = payload
+        # even; slot is consistent
+        pack_into("<Q", buf, offset, seq + 2)
+        return True
+
+    def read(self, tracker, row) -> list:
+        """
+        :return list(): the consistent payloads of every slot in the (tracker, row) ring
+        """
+        buf = self.shm.buf
+        payloads = []
+        for offset, size in self.offsets.get((tracker, row), []):
+            seq, length, _, _ = unpack_from(HEADER, buf, offset)
+            # never written, or being written
+            if not seq or seq % 2 or length > size:
+                continue
+            start = offset + HEADER_SIZE
+            payload = bytes(buf[start : start + length])
+            # the slot was rewritten while we copied it
+            if unpack_from("<Q", buf, offset)[0] != seq:
+                continue
+            payloads.append(payload)
+        return payloads
+
+    def digests(self, tracker, row) -> list:
+        """
+        read only the slot headers of the (tracker, row) ring, no payload is copied
+        :return list(): [(digest, slot, seq, node), ...] of every consistent slot
+        """
+        buf = self.shm.buf
+        nodes = self.constants.chain.NODES
+        digests = []
+        for slot, (offset, size) in enumerate(self.offsets.get((tracker, row), [])):
+            seq, length, digest, node = unpack_from(HEADER, buf, offset)
+            if not seq or seq % 2 or length > size:
+                continue
+            # the header was rewritten while we unpacked it
+            if unpack_from("<Q", buf, offset)[0] != seq:
+                continue
+            node = nodes[node] if node < len(nodes) else None
+            digests.append((digest, slot, seq, node))
+        return digests
+
+    def payload(self, tracker, row, slot, seq):
+        """
+        copy one slot payload, provided it is still the write seen by digests()
+        :return bytes() or None: None if the slot has since been rewritten
+        """
+        offset, _ = self.offsets[(tracker, row)][slot]
+        buf = self.shm.buf
+        length = unpack_from(HEADER, buf, offset)[1]
+        start = offset + HEADER_SIZE
+        payload = bytes(buf[start : start + length])
+        if unpack_from("<Q", buf, offset)[0] != seq:
+            return None
+        return payload
+
+    def versions(self) -> dict:
+        """
+        :return dict(): {(tracker, row): version} where version changes on every write
+        """
+        buf = self.shm.buf
+        return {
+            key: sum(unpack_from("<Q", buf, offset)[0] for offset, _ in slots)
+            for key, slots in self.offsets.items()
+        }
+
+    def close(self):
+        """
+        detach from the shared memory block
+        """
+        try:
+            self.shm.close()
+        except Exception:
+            pass
+
+    def unlink(self):
+        """
+        detach and destroy the shared memory block; parent process only
+        """
+        self.close()
+        try:
+            self.shm.unlink()
+        except Exception:
+            pass
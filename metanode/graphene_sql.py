@@ -16,22 +16,129 @@ mavens are streaming windowed lists of json data
 colleced directly from public api nodes user whitelist as "mostly trustworthy"
 regenerative multiprcocessing prevents failed sockets from hanging main process
 the statiscial mode of these lists is moved to the respective base table
+each maven window is a ring of MAVEN_WINDOW json rows in maven_samples
+keyed by (tbl, name, tracker, slot), so adding a sample is a single row upsert
 note in some cases a REAL or INTEGER may be a TEXT as maven, eg.
 maven.account.fees.cancel = "[0.2, 0.2, 0.2, 0.1]" ->
 account.fees.cancel = 0.2
 """
 # STANDARD MODULES
-import json
 import os
+import threading
 import time
+from copy import deepcopy
+from functools import lru_cache
+from itertools import groupby
 from sqlite3 import OperationalError, Row, connect
 
 # GRAPHENE MODULES
-from .graphene_constants import GrapheneConstants
-from .graphene_utils import it, jprint
+from .graphene_codec import encode, loads
+from .graphene_constants import GrapheneConstants, MetanodeConfig
+from .graphene_utils import canonical, digest, it, jprint
 
 # GLOBAL CONSTANTS
 DEV = False
+# one long lived connection per process / thread, see Sql.connection()
+LOCAL = threading.local()
+# per process record of lock contention, see Sql.transaction()
+# locks, lock_wait and lock_max time every BEGIN IMMEDIATE, busy_timeout included
+CONTENTION = {"retries": 0, "wait": 0.0, "locks": 0, "lock_wait": 0.0, "lock_max": 0.0}
+# {process name: unix} of the latest contention report, see Sql.report_contention()
+REPORTED = {}
+# every write to a table bumps its row in versions, see Sql.table_versions()
+VERSION_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS {table}_{event} AFTER {event} ON {table} BEGIN "
+    "UPDATE versions SET version=version + 1 WHERE tbl='{table}'; END"
+)
+# append one sample to a maven window; the slot is the next version of the window
+# wrapped at MAVEN_WINDOW, so the oldest sample in the ring is overwritten in place
+MAVEN_UPSERT = (
+    "INSERT INTO maven_samples "
+    "(tbl, name, tracker, slot, version, node, digest, sooth) "
+    "SELECT ?, ?, ?, version % ?, version, ?, ?, ? FROM ("
+    "SELECT IFNULL(MAX(version), 0) + 1 AS version FROM maven_samples "
+    "WHERE tbl=? AND name=? AND tracker=?"
+    ") WHERE 1 "
+    "ON CONFLICT (tbl, name, tracker, slot) "
+    "DO UPDATE SET version=excluded.version, node=excluded.node, "
+    "digest=excluded.digest, sooth=excluded.sooth"
+)
+# the version of a maven window is the version of its newest sample
+MAVEN_VERSIONS_SELECT = (
+    "SELECT tbl, name, tracker, MAX(version) AS version FROM maven_samples "
+    "GROUP BY tbl, name, tracker"
+)
+# read one maven window, oldest sample first, with a single indexed range query
+MAVEN_WINDOW_SELECT = (
+    "SELECT sooth FROM maven_samples "
+    "WHERE tbl=? AND name=? AND tracker=? ORDER BY version"
+)
+# read only the content digests of one maven window, oldest sample first
+MAVEN_DIGESTS_SELECT = (
+    "SELECT digest, node, version FROM maven_samples "
+    "WHERE tbl=? AND name=? AND tracker=? ORDER BY version"
+)
+# read the json text of one sample in a maven window by its content digest
+MAVEN_SOOTH_SELECT = (
+    "SELECT sooth FROM maven_samples "
+    "WHERE tbl=? AND name=? AND tracker=? AND digest=? LIMIT 1"
+)
+# node scores are exponentially weighted moving averages, x += alpha * (sample - x)
+# the first sample of a NULL average is taken as is
+NODE_LATENCY_UPDATE = (
+    "UPDATE nodes SET "
+    "ewma_ping=IFNULL(ewma_ping + :alpha * (:ping - ewma_ping), :ping), "
+    "ewma_handshake="
+    "IFNULL(ewma_handshake + :alpha * (:handshake - ewma_handshake), :handshake) "
+    "WHERE url=:url"
+)
+NODE_RATES_UPDATE = (
+    "UPDATE nodes SET "
+    "error_rate=IFNULL(error_rate + :alpha * (:errors - error_rate), :errors), "
+    "timeout_rate="
+    "IFNULL(timeout_rate + :alpha * (:timeouts - timeout_rate), :timeouts) "
+    "WHERE url=:url"
+)
+# latency measured passively from maven rpc traffic; a NULL sample leaves x as is
+NODE_PASSIVE_UPDATE = (
+    "UPDATE nodes SET "
+    "ping=IFNULL(:ping, ping), "
+    "handshake=IFNULL(:handshake, handshake), "
+    "ewma_ping=IFNULL(ewma_ping + :alpha * (:ping - ewma_ping), "
+    "IFNULL(:ping, ewma_ping)), "
+    "ewma_handshake=IFNULL(ewma_handshake + :alpha * (:handshake - ewma_handshake), "
+    "IFNULL(:handshake, ewma_handshake)), "
+    "sampled=:sampled "
+    "WHERE url=:url"
+)
+NODE_MINORITY_UPDATE = (
+    "UPDATE nodes SET "
+    "minority_rate="
+    "IFNULL(minority_rate + :alpha * (:minority - minority_rate), :minority) "
+    "WHERE url=:url"
+)
+# the lock contention of one process, kept by name in the timing contention json
+CONTENTION_UPDATE = (
+    "UPDATE timing SET contention=json_set(IFNULL(contention, '{}'), ?, json(?))"
+)
+# append only market trades; the oracle appends each new history consensus
+TRADES_INSERT = (
+    "INSERT OR IGNORE INTO trades (pair, sequence, unix, price, amount, type) "
+    "VALUES (?,?,?,?,?,?)"
+)
+TRADES_EXPIRE = "DELETE FROM trades WHERE pair=? AND unix<?"
+# the trades of a pair in a unix time range and a sequence range, oldest first
+# unary + keeps sqlite from the index of the other range; by time, or by sequence
+TRADES_BY_TIME = (
+    "SELECT unix, price, amount, type, sequence FROM trades "
+    "WHERE pair=? AND unix>=? AND unix<? AND +sequence>? AND +sequence<=? "
+    "ORDER BY unix, sequence LIMIT ?"
+)
+TRADES_BY_SEQUENCE = (
+    "SELECT unix, price, amount, type, sequence FROM trades "
+    "WHERE pair=? AND +unix>=? AND +unix<? AND sequence>? AND sequence<=? "
+    "ORDER BY sequence LIMIT ?"
+)
 # self.constants.core.PATH = os.path.dirname(os.path.abspath(__file__)) + "/database"
 CREATES = [
     """
@@ -56,7 +163,14 @@ CREATES = [
     handshake REAL,
     blocktime INT,
     code INT,
-    status TEXT
+    status TEXT,
+    ewma_ping REAL,
+    ewma_handshake REAL,
+    error_rate REAL,
+    timeout_rate REAL,
+    minority_rate REAL,
+    sampled REAL,
+    probed REAL
     )
     """,
     """
@@ -75,7 +189,10 @@ CREATES = [
     ping REAL,
     handshake REAL,
     read REAL,
-    begin REAL
+    begin REAL,
+    handover REAL,
+    warm REAL,
+    contention TEXT
     )
     """,
     """
@@ -103,41 +220,198 @@ CREATES = [
     )
     """,
     """
-    CREATE TABLE maven_account (
-    name TEXT PRIMARY KEY,
-    fees_account TEXT,
-    ltm TEXT,
-    cancels TEXT
+    CREATE TABLE maven_samples (
+    tbl TEXT,
+    name TEXT,
+    tracker TEXT,
+    slot INT,
+    version INT,
+    node TEXT,
+    digest BLOB,
+    sooth TEXT,
+    PRIMARY KEY (tbl, name, tracker, slot)
     )
     """,
     """
-    CREATE TABLE maven_assets (
-    name TEXT PRIMARY KEY,
-    supply TEXT,
-    fees_asset TEXT,
-    balance TEXT
+    CREATE TABLE versions (
+    tbl TEXT PRIMARY KEY,
+    version INT
     )
     """,
     """
-    CREATE TABLE maven_pairs (
-    name TEXT PRIMARY KEY,
-    ops TEXT,
-    last TEXT,
-    book TEXT,
-    history TEXT,
-    opens TEXT,
-    fills TEXT
-    )
-    """,
-    """
-    CREATE TABLE maven_timing (
-    name TEXT,
-    blocknum TEXT,
-    blocktime TEXT,
-    read TEXT
+    CREATE TABLE trades (
+    pair TEXT,
+    sequence INT,
+    unix INT,
+    price REAL,
+    amount REAL,
+    type TEXT,
+    PRIMARY KEY (pair, sequence)
     )
     """,
 ]
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS trades_unix ON trades (pair, unix)",
+]
+
+
+def schema(create) -> tuple:
+    """
+    the table name and [(column, type), ...] of one CREATES statement
+    """
+    lines = [i.strip().rstrip(",") for i in create.strip().splitlines()]
+    columns = [
+        tuple(i.split()[:2]) for i in lines[1:-1] if not i.startswith("PRIMARY KEY")
+    ]
+    return lines[0].split()[2], columns
+
+
+# columns holding json text, or columnar binary; see graphene_codec
+JSON_COLUMNS = frozenset(
+    [
+        "fees_account",
+        "fees_asset",
+        "balance",
+        "book",
+        "history",
+        "ops",
+        "opens",
+        "fills",
+        "contention",
+    ]
+)
+
+
+class LazyRow(dict):
+    """
+    one sqlite row as a dict; each json column is decoded on first access
+    ~
+    row["last"] never touches the json text of row["book"]
+    row["book"] decodes once, then is an ordinary dict value
+    iteration, items(), values(), ==, repr() and dict(row) decode every column
+    ~
+    a copy is independent of the row it was copied from
+    columns still text decode on their own; decoded columns are deep copied
+    so a cached row, never itself decoded, is copied for the cost of its plain columns
+    """
+
+    __slots__ = ("texts",)
+
+    def __init__(self, values=(), texts=None):
+        super().__init__(values)
+        # {column: json text} not yet decoded in this row
+        self.texts = {} if texts is None else texts
+
+    def __missing__(self, key):
+        value = loads(self.texts.pop(key))
+        dict.__setitem__(self, key, value)
+        return value
+
+    def decode(self):
+        """
+        decode every json column still held as text
+        """
+        for key in list(self.texts):
+            self.__missing__(key)
+        return self
+
+    def without(self, key):
+        """
+        a copy without one column, nothing is decoded; see ld2dd()
+        """
+        row = self.copy()
+        del row[key]
+        return row
+
+    def copy(self):
+        # dict.copy() would iterate this row, and so decode it
+        # sqlite values are never containers; only decoded json values are deep copied
+        return LazyRow(
+            {
+                k: deepcopy(v) if isinstance(v, (dict, list)) else v
+                for k, v in dict.items(self)
+            },
+            dict(self.texts),
+        )
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self.texts
+
+    def __len__(self):
+        return dict.__len__(self) + len(self.texts)
+
+    def __iter__(self):
+        return iter(list(dict.keys(self)) + list(self.texts))
+
+    def __setitem__(self, key, value):
+        self.texts.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if self.texts.pop(key, None) is None:
+            dict.__delitem__(self, key)
+
+    def keys(self):
+        return dict.keys(self.decode())
+
+    def items(self):
+        return dict.items(self.decode())
+
+    def values(self):
+        return dict.values(self.decode())
+
+    def pop(self, *args):
+        return dict.pop(self.decode(), *args)
+
+    def popitem(self):
+        return dict.popitem(self.decode())
+
+    def setdefault(self, *args):
+        return dict.setdefault(self.decode(), *args)
+
+    def update(self, *args, **kwargs):
+        dict.update(self.decode(), *args, **kwargs)
+
+    def clear(self):
+        self.texts.clear()
+        dict.clear(self)
+
+    def __eq__(self, other):
+        return dict.__eq__(self.decode(), other)
+
+    def __ne__(self, other):
+        return dict.__ne__(self.decode(), other)
+
+    def __repr__(self):
+        return dict.__repr__(self.decode())
+
+    def __reduce__(self):
+        return (LazyRow, (dict(dict.items(self)), dict(self.texts)))
+
+
+def json_rows(curfetchall) -> list:
+    """
+    sqlite rows as a list of dicts, the json text columns decoded lazily, see LazyRow
+    """
+    if not curfetchall:
+        return []
+    columns = curfetchall[0].keys()
+    lazy = [column in JSON_COLUMNS for column in columns]
+    data = []
+    for row in curfetchall:
+        values, texts = {}, {}
+        for column, is_json, val in zip(columns, lazy, row):
+            if is_json and val is not None:
+                texts[column] = val
+            else:
+                values[column] = val
+        data.append(LazyRow(values, texts))
+    return data
+
+
 SELECTS = [
     """
     SELECT * FROM chain
@@ -152,33 +426,25 @@ SELECTS = [
     SELECT * FROM account
     """,
     """
-    SELECT * FROM maven_account
-    """,
-    """
     SELECT * FROM timing
     """,
     """
-    SELECT * FROM maven_timing
-    """,
-    """
     SELECT * FROM assets
     """,
     """
-    SELECT * FROM maven_assets
-    """,
-    """
     SELECT * FROM pairs
     """,
     """
-    SELECT * FROM maven_pairs
+    SELECT * FROM maven_samples
     """,
 ]
 UPDATES = [
     (
         """
-        UPDATE nodes SET ping=?, code=?, status=?
+        UPDATE nodes SET ping=?, code=?, status=?,
+        error_rate=?, timeout_rate=?, minority_rate=?
         """,
-        ("999.9", "1000", "INITIALIZING"),
+        ("999.9", "1000", "INITIALIZING", 0, 0, 0),
     ),
     (
         """
@@ -198,31 +464,138 @@ UPDATES = [
         """,
         ("0", "{}", "[]", "[]", "[]", "[]"),
     ),
-    (
+]
+
+
+@lru_cache(maxsize=1024)
+def normalize(query) -> tuple:
+    """
+    the query on one line without double spaces, and whether it is a SELECT
+    cached, so a statement executed again costs one dict lookup
+    """
+    query = " ".join(query.replace("\n", " ").split())
+    return query, "SELECT" in query
+
+
+class Statements:
+    """
+    registry of the sql statements whose table or column varies
+    built once from the hard coded TRACKER_TABLE, VALID_TABLES and VALID_COLUMNS
+    and from the schema of CREATES
+    ~
+    STMT.update_maven("pairs", "book")
+    STMT.update_timing("ping")
+    STMT.select_nodes("ping")
+    STMT.select_table("assets")
+    STMT.select_columns("pairs", ("name", "last"), rows=2)
+    STMT.table_info("pairs")
+    STMT.add_column("pairs", "fills")
+    STMT.version_trigger("pairs", "UPDATE")
+    STMT.begin("IMMEDIATE")
+    ~
+    an identifier unknown to the registry raises KeyError
+    no caller ever formats a table or column name into sql
+    """
+
+    def __init__(self, config):
+        self.columns = {k: set(v) for k, v in config.VALID_COLUMNS.items()}
+        # the row key of each table, the first of its VALID_COLUMNS
+        self.keys = {k: v[0] for k, v in config.VALID_COLUMNS.items()}
+        self.statements = {}
+        for tracker, table in config.TRACKER_TABLE.items():
+            self.statements[("update_maven", table, tracker)] = (
+                f"UPDATE {table} SET {tracker}=? WHERE name=?"
+            )
+            if table == "timing":
+                self.statements[("update_timing", tracker)] = (
+                    f"UPDATE timing SET {tracker}=?"
+                )
+        for column in ["ping", "handshake"]:
+            self.statements[("select_nodes", column)] = (
+                f"SELECT {column} FROM nodes WHERE code=200"
+            )
+        for table in config.VALID_TABLES:
+            self.statements[("select_table", table)] = f"SELECT * FROM {table}"
+            for event in ["INSERT", "UPDATE", "DELETE"]:
+                self.statements[("version_trigger", table, event)] = (
+                    VERSION_TRIGGER.format(table=table, event=event)
+                )
+        for mode in ["DEFERRED", "IMMEDIATE", "EXCLUSIVE"]:
+            self.statements[("begin", mode)] = f"BEGIN {mode}"
+        for create in CREATES:
+            table, columns = schema(create)
+            self.statements[("table_info", table)] = f"PRAGMA table_info({table})"
+            for column, kind in columns:
+                self.statements[("add_column", table, column)] = (
+                    f"ALTER TABLE {table} ADD COLUMN {column} {kind}"
+                )
+
+    def update_maven(self, table, tracker) -> str:
         """
-        UPDATE maven_account SET fees_account=?, ltm=?, cancels=?
-        """,
-        ("[]", "[]", "[]"),
-    ),
-    (
+        write the oracle mode of a maven window to its row
         """
-        UPDATE maven_assets SET supply=?, fees_asset=?, balance=?
-        """,
-        ("[]", "[]", "[]"),
-    ),
-    (
+        return self.statements[("update_maven", table, tracker)]
+
+    def update_timing(self, tracker) -> str:
         """
-        UPDATE maven_pairs SET last=?, book=?, history=?, opens=?, fills=?, ops=?
-        """,
-        ("[]", "[]", "[]", "[]", "[]", "[]"),
-    ),
-    (
+        write one timing column
         """
-        UPDATE maven_timing SET blocknum=?, blocktime=?, read=?
-        """,
-        ("[]", "[]", "[]"),
-    ),
-]
+        return self.statements[("update_timing", tracker)]
+
+    def select_nodes(self, column) -> str:
+        """
+        read one column of every connected node
+        """
+        return self.statements[("select_nodes", column)]
+
+    def select_table(self, table) -> str:
+        """
+        read every row of a client readable table
+        """
+        return self.statements[("select_table", table)]
+
+    def table_info(self, table) -> str:
+        """
+        read the columns of a table as built, see Sql.warm_start()
+        """
+        return self.statements[("table_info", table)]
+
+    def add_column(self, table, column) -> str:
+        """
+        add a column of CREATES missing from a table built by an older schema
+        """
+        return self.statements[("add_column", table, column)]
+
+    def version_trigger(self, table, event) -> str:
+        """
+        bump the version of a client readable table on every INSERT, UPDATE or DELETE
+        """
+        return self.statements[("version_trigger", table, event)]
+
+    def begin(self, mode) -> str:
+        """
+        open a transaction; DEFERRED, IMMEDIATE or EXCLUSIVE
+        """
+        return self.statements[("begin", mode)]
+
+    def select_columns(self, table, columns, rows=None) -> str:
+        """
+        read some columns of a table; of every row, or of rows keyed in ? x rows
+        the row key is the first of VALID_COLUMNS[table]; built on first use
+        """
+        key = ("select_columns", table, tuple(columns), rows)
+        statement = self.statements.get(key)
+        if statement is None:
+            if not set(columns) <= self.columns[table]:
+                raise KeyError(columns)
+            statement = f"SELECT {', '.join(columns)} FROM {table}"
+            if rows is not None:
+                statement += f" WHERE {self.keys[table]} IN ({','.join('?' * rows)})"
+            statement = self.statements.setdefault(key, statement)
+        return statement
+
+
+STMT = Statements(MetanodeConfig)
 
 
 class Sql:
@@ -242,11 +615,13 @@ class Sql:
         # user input w/ warning
         # print("\033c", )
         # print(it("red", "WARNING THIS SCRIPT WILL RESTART DATABASE AND ERASE ALL DATA\n"), )
-        # erase the database
-        try:
-            os.remove(self.constants.chain.DATABASE)
-        except FileNotFoundError:
-            pass
+        # erase the database, along with its write ahead log
+        self.disconnect()
+        for suffix in ["", "-wal", "-shm"]:
+            try:
+                os.remove(self.constants.chain.DATABASE + suffix)
+            except FileNotFoundError:
+                pass
         # print("creating sqlite3:", it("green", self.constants.chain.DATABASE), "\n", )
         print(
             "creating sqlite3...",
@@ -278,18 +653,6 @@ class Sql:
                     self.constants.metanode.BEGIN,
                 ),
             ),
-            (
-                """
-                INSERT INTO maven_timing (name, blocktime, blocknum, read)
-                VALUES (?,?,?,?)
-                """,
-                (
-                    self.constants.chain.ACCOUNT,
-                    "[]",
-                    "[]",
-                    "[]",
-                ),
-            ),
             (
                 """
                 INSERT INTO account (name) VALUES (?)
@@ -305,12 +668,6 @@ class Sql:
                     self.constants.chain.CORE,
                 ),
             ),
-            (
-                """
-                INSERT INTO maven_account (name) VALUES (?)
-                """,
-                (self.constants.chain.ACCOUNT,),
-            ),
         ]
         for asset in self.constants.chain.ASSETS:
             inserts.append(
@@ -321,14 +678,6 @@ class Sql:
                     (asset,),
                 )
             )
-            inserts.append(
-                (
-                    """
-                    INSERT INTO maven_assets (name) VALUES (?)
-                    """,
-                    (asset,),
-                )
-            )
         for pair in self.constants.chain.ALL_PAIRS:
             inserts.append(
                 (
@@ -338,14 +687,6 @@ class Sql:
                     (pair,),
                 )
             )
-            inserts.append(
-                (
-                    """
-                    INSERT INTO maven_pairs (name) VALUES (?)
-                    """,
-                    (pair,),
-                )
-            )
         for node in self.constants.chain.NODES:
             inserts.append(
                 (
@@ -357,10 +698,11 @@ class Sql:
             )
         # new table creation
         queries = []
-        for query in CREATES:
+        for query in CREATES + INDEXES:
             dml = {"query": query, "values": tuple()}
             queries.append(dml)
         self.execute(queries)
+        self.transaction(self.version_triggers)
         # row creation in each table
         queries = []
         for insert in inserts:
@@ -379,103 +721,470 @@ class Sql:
                 jprint(self.execute(query))
         # ~ raise ValueError("created database")
 
+    def warm_start(self) -> bool:
+        """
+        reuse the existing db when it was built for the current configuration
+        ~
+        the schema is migrated in place; missing tables and columns are added
+        the harvested chain metadata and the last oracle values are kept
+        timing.warm is the time those oracle values were last written
+        the maven windows are emptied so the new mavens never vote with stale data
+        :return bool(): False if there is no usable db; call restart() instead
+        """
+        if not os.path.isfile(self.constants.chain.DATABASE):
+            return False
+        chain = self.constants.chain
+
+        def migrate(cur):
+            for create in CREATES:
+                table, columns = schema(create)
+                cur.execute(STMT.table_info(table))
+                existing = [i[1] for i in cur.fetchall()]
+                if not existing:
+                    cur.execute(create)
+                for column, _ in columns:
+                    if existing and column not in existing:
+                        cur.execute(STMT.add_column(table, column))
+            for index in INDEXES:
+                cur.execute(index)
+
+        def matches(cur) -> bool:
+            cur.execute("SELECT name, id FROM chain")
+            if [tuple(i) for i in cur.fetchall()] != [(chain.NAME, chain.ID)]:
+                return False
+            # every row must hold the ids harvested by the cache task
+            for table, names in [
+                ("account", [chain.ACCOUNT]),
+                ("assets", chain.ASSETS),
+                ("pairs", chain.ALL_PAIRS),
+            ]:
+                cur.execute(STMT.select_columns(table, ("name", "id")))
+                rows = cur.fetchall()
+                if sorted(i[0] for i in rows) != sorted(names):
+                    return False
+                if any(i[1] is None for i in rows):
+                    return False
+            return True
+
+        def reset(cur):
+            cur.execute("DELETE FROM maven_samples")
+            # nodes keep their scores; nodes new to the configuration are added
+            placeholders = ",".join("?" * len(chain.NODES))
+            cur.execute(
+                f"DELETE FROM nodes WHERE url NOT IN ({placeholders})", chain.NODES
+            )
+            for node in chain.NODES:
+                cur.execute("INSERT OR IGNORE INTO nodes (url) VALUES (?)", (node,))
+            # the default node columns, see UPDATES
+            cur.execute(UPDATES[0][0] + " WHERE code IS NULL", UPDATES[0][1])
+            cur.execute(
+                "UPDATE timing SET warm=server, begin=?, handover=NULL, contention=NULL",
+                (self.constants.metanode.BEGIN,),
+            )
+
+        def run(cur) -> bool:
+            migrate(cur)
+            self.version_triggers(cur)
+            if not matches(cur):
+                return False
+            reset(cur)
+            return True
+
+        try:
+            # ==========================================================================
+            # SQL CONNECT ** minimize access time **
+            # ==========================================================================
+            warm = self.transaction(run)
+            # ==========================================================================
+            # SQL CLOSE
+            # ==========================================================================
+        except Exception as error:
+            if DEV:
+                print("warm start refused", error.args)
+            warm = False
+        if not warm:
+            self.disconnect()
+        return warm
+
+    def version_triggers(self, cur):
+        """
+        create the versions row and write triggers of every client readable table
+        versions start from the clock, so a recreated db never repeats a version
+        """
+        for table in self.constants.metanode.VALID_TABLES:
+            cur.execute(
+                "INSERT OR IGNORE INTO versions (tbl, version) VALUES (?,?)",
+                (table, time.time_ns()),
+            )
+            for event in ["INSERT", "UPDATE", "DELETE"]:
+                # SECURITY table names are from the hard coded VALID_TABLES
+                cur.execute(STMT.version_trigger(table, event))
+
+    def table_versions(self) -> dict:
+        """
+        returns {table: version} of every client readable table
+        ~
+        PRAGMA data_version changes only when another connection commits
+        so while nothing was written, this is a single integer check
+        :return dict(): empty if the db has no versions table
+        """
+        con = self.connection()
+        try:
+            key = (
+                con.execute("PRAGMA data_version").fetchone()[0],
+                getattr(LOCAL, "commits", 0),
+            )
+            cached = LOCAL.versions.get(self.constants.chain.DATABASE)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            versions = dict(
+                tuple(i) for i in con.execute("SELECT tbl, version FROM versions")
+            )
+        except OperationalError:
+            return {}
+        LOCAL.versions[self.constants.chain.DATABASE] = (key, versions)
+        return versions
+
+    def connection(self):
+        """
+        return the long lived connection of this process / thread
+        connections are opened once in WAL journal mode so readers never block writers
+        and lock contention is waited out by sqlite itself with busy_timeout
+        """
+        # a forked child must never reuse the connections of its parent
+        if getattr(LOCAL, "pid", None) != os.getpid():
+            LOCAL.pid = os.getpid()
+            LOCAL.connections = {}
+            # one reused cursor per connection
+            LOCAL.cursors = {}
+            # {database: ((data_version, commits), {table: version})}
+            LOCAL.versions = {}
+        con = LOCAL.connections.get(self.constants.chain.DATABASE)
+        if con is None:
+            # isolation_level=None; transactions are explicit in Sql.transaction()
+            # sqlite keeps SQL_STATEMENT_CACHE compiled statements per connection
+            con = connect(
+                self.constants.chain.DATABASE,
+                isolation_level=None,
+                cached_statements=self.constants.metanode.SQL_STATEMENT_CACHE,
+            )
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute(
+                f"PRAGMA busy_timeout={int(self.constants.metanode.SQL_BUSY_TIMEOUT * 1000)}"
+            )
+            con.row_factory = Row
+            LOCAL.connections[self.constants.chain.DATABASE] = con
+            LOCAL.cursors[self.constants.chain.DATABASE] = con.cursor()
+        return con
+
+    def cursor(self):
+        """
+        return the reused cursor of the long lived connection of this process / thread
+        """
+        self.connection()
+        return LOCAL.cursors[self.constants.chain.DATABASE]
+
+    def disconnect(self):
+        """
+        close the long lived connection of this process / thread, if any
+        """
+        if getattr(LOCAL, "pid", None) == os.getpid():
+            LOCAL.versions.pop(self.constants.chain.DATABASE, None)
+            LOCAL.cursors.pop(self.constants.chain.DATABASE, None)
+            con = LOCAL.connections.pop(self.constants.chain.DATABASE, None)
+            if con is not None:
+                con.close()
+
+    @staticmethod
+    def contention() -> dict:
+        """
+        returns retries and seconds waited on a locked database by this process
+        """
+        return dict(CONTENTION)
+
+    def report_contention(self, name):
+        """
+        write the contention of this process to timing, at most every CONTENTION_REPORT
+        metanode.timing["contention"][name] is then readable by any client
+        """
+        now = time.time()
+        if now - REPORTED.get(name, 0) < self.constants.metanode.CONTENTION_REPORT:
+            return
+        REPORTED[name] = now
+        contention = {k: round(v, 6) for k, v in CONTENTION.items()}
+        self.execute(CONTENTION_UPDATE, (f"$.{name}", canonical(contention)))
+
+    def transaction(self, func, mode="IMMEDIATE", commit=None):
+        """
+        run func(cursor) on the long lived connection and return its result
+        mode "IMMEDIATE" reserves the write lock up front, "DEFERRED" for reads
+        mode None runs func in autocommit; eg. a single SELECT
+        commit(cursor), if given, ends the transaction in place of COMMIT
+        the whole transaction is retried if the database stays locked
+        """
+        # an unknown mode raises KeyError before the database is touched
+        begin_mode = None if mode is None else STMT.begin(mode)
+        pause = 0
+        while True:
+            start = time.time()
+            con = None
+            try:
+                cur = self.cursor()
+                con = cur.connection
+                if mode is not None:
+                    begin = time.time()
+                    cur.execute(begin_mode)
+                    if mode == "IMMEDIATE":
+                        # the write lock is held once BEGIN IMMEDIATE returns
+                        begin = time.time() - begin
+                        CONTENTION["locks"] += 1
+                        CONTENTION["lock_wait"] += begin
+                        CONTENTION["lock_max"] = max(CONTENTION["lock_max"], begin)
+                ret = func(cur)
+                if mode is not None:
+                    if commit is None:
+                        cur.execute("COMMIT")
+                    else:
+                        commit(cur)
+                    # data_version does not see the commits of this connection
+                    LOCAL.commits = getattr(LOCAL, "commits", 0) + 1
+                return ret
+            except OperationalError as error:
+                if con is not None and con.in_transaction:
+                    con.rollback()
+                # anything but a busy database deserves a fresh connection
+                if "locked" not in str(error) and "busy" not in str(error):
+                    self.disconnect()
+                pause += 1
+                # ascending pause here prevents excess cpu on corruption of database
+                backoff = min(5, 1.01**pause - 1)
+                CONTENTION["retries"] += 1
+                CONTENTION["wait"] += time.time() - start + backoff
+                if DEV:
+                    print(
+                        f"Race condition at {int(time.time())} during Sql.transaction, pausing for {backoff:2f} secs",
+                        error.args,
+                    )
+                time.sleep(backoff)
+            except Exception:
+                if con is not None and con.in_transaction:
+                    con.rollback()
+                raise
+
     def execute(self, query, values=()):
         """
         execute discrete sql queries, handle race condition gracefully
         if query is a string, assume values is a
         else, query can be a list of dicts with keys ["query","values"]
-        While True:
-            Try:
-                con = connect(DB)
-                cur = con.cursor()
-                cur.execute(query, values)
-                ret = cur.fetchall()
-                con.commit()
-                con.close()
-                break
-            Except:
-                continue
+        batched queries are write only and executed in a single transaction
         :return ret:
         """
-        queries = []
         # handle both single query and multiple queries
         if isinstance(query, str):
-            queries.append({"query": query, "values": values})
-        else:
-            queries = query
-        # strip double spaces and new lines in each query
-        for idx, dml in enumerate(queries):
-            queries[idx]["query"] = " ".join(dml["query"].replace("\n", " ").split())
+            query = [{"query": query, "values": values}]
+        # strip double spaces and new lines in each query, once per statement
+        queries = [normalize(dml["query"]) + (dml["values"],) for dml in query]
         # print sql except when...
-        for dml in queries:
+        for text, _, vals in queries:
             if DEV:
                 print(
-                    it("yellow", f"'query': {dml['query']}"),
+                    it("yellow", f"'query': {text}"),
                 )
                 print(
-                    it("green", f"'values': {dml['values']}\n"),
+                    it("green", f"'values': {vals}\n"),
                 )
-        # attempt to update database until satisfied
-        pause = -1
-        curfetchall = None
-        while True:
-            try:
-                pause += 1
-                # only allow batched write queries
-                if len(queries) > 1:
-                    for dml in queries:
-                        if "SELECT" in dml["query"]:
-                            raise ValueError("batch queries must be write only")
-                # ======================================================================
-                # SQL CONNECT
-                # ======================================================================
-                con = connect(self.constants.chain.DATABASE)
-                for dml in queries:
-                    con.row_factory = Row
-                    cur = con.cursor()
-                    cur.execute(dml["query"], dml["values"])
-                    curfetchall = cur.fetchall()
-                con.commit()
-                con.close()
-                # ======================================================================
-                # SQL CLOSE
-                # ======================================================================
-                data = [dict(i) for i in curfetchall]
-                for idx, row in enumerate(data):
-                    for key, val in row.items():
-                        # these are sql REAL, but TEXT when maven_
-                        if (
-                            key
-                            in [
-                                "ltm",
-                                "supply",
-                                "last",
-                            ]
-                            and "maven_" in dml["query"]
-                        ):
-                            data[idx][key] = json.loads(val)
-                        # these are valid json sql REAL
-                        elif key in [
-                            "fees_account",
-                            "fees_asset",
-                            "balance",
-                            "book",
-                            "history",
-                            "ops",
-                            "opens",
-                            "fills",
-                        ]:
-                            data[idx][key] = json.loads(val)
-                return data
-            except OperationalError:
-                if DEV:
-                    print(
-                        f"Race condition at {int(time.time())} during Sql.execute, pausing for {min(5, 1.01**pause - 1):2f} secs",
+        # only allow batched write queries
+        if len(queries) > 1:
+            if any(select for _, select, _ in queries):
+                raise ValueError("batch queries must be write only")
+
+        def run(cur):
+            if len(queries) == 1:
+                cur.execute(queries[0][0], queries[0][2])
+                return cur.fetchall()
+            # consecutive writes of one statement are executed as one batch
+            for text, group in groupby(queries, key=lambda dml: dml[0]):
+                group = [dml[2] for dml in group]
+                if len(group) == 1:
+                    cur.execute(text, group[0])
+                else:
+                    cur.executemany(text, group)
+            return []
+
+        # ==============================================================================
+        # SQL CONNECT
+        # ==============================================================================
+        if len(queries) == 1 and queries[0][0].startswith("SELECT"):
+            curfetchall = self.transaction(run, mode=None)
+        else:
+            curfetchall = self.transaction(run)
+        # ==============================================================================
+        # SQL CLOSE
+        # ==============================================================================
+        return json_rows(curfetchall)
+
+
+class MavenBuffer:
+    """
+    collect every sooth a maven gathers during one iteration
+    then flush them to the maven tables in a single sql transaction
+    ~
+    buffer = MavenBuffer(constants, maven_free, maven_id)
+    buffer.add(sooth, tracker, row)
+    buffer.flush()
+    ~
+    when given SharedWindows the sooths bypass sqlite
+    and each sooth is written to the maven_id slot of its shared memory ring
+    ~
+    buffer.node tags the sooths with the node they came from
+    buffer.rate() adds rpc error and timeout rates to the node scores
+    buffer.latency() adds ping and handshake measured from the maven's own rpc calls
+    ~
+    when given a Value("d") flushed, the time of every flush is stamped on it
+    """
+
+    def __init__(self, constants, maven_free, maven_id=None, shared=None, flushed=None):
+        self.constants = constants
+        # maven_free.value is locked by parent process prior to Process termination
+        self.maven_free = maven_free
+        self.maven_id = maven_id
+        self.shared = shared
+        self.flushed = flushed
+        self.sql = Sql(constants)
+        self.sooths = []
+        # the node of the sooths being added; the oracle scores nodes by their votes
+        self.node = None
+        # {node: {"errors": float, "timeouts": float}} rpc rates of this iteration
+        self.rates = {}
+        # {node: {"ping": float, "handshake": float}} passive latency of this iteration
+        self.latencies = {}
+
+    def add(self, sooth, tracker, row):
+        """
+        buffer a sooth gathered from some tracker for some row
+        """
+        if tracker == "fills" and not sooth:
+            return
+        self.sooths.append((tracker, row, self.node, sooth))
+
+    def rate(self, node, calls, errors, timeouts):
+        """
+        buffer the share of rpc calls to a node which failed, or timed out
+        """
+        if calls and node in self.constants.chain.NODES:
+            self.rates[node] = {"errors": errors / calls, "timeouts": timeouts / calls}
+
+    def latency(self, node, pings, handshakes):
+        """
+        buffer the mean ping and handshake of the rpc calls to a node, if any
+        """
+        if (pings or handshakes) and node in self.constants.chain.NODES:
+            self.latencies[node] = {
+                "ping": sum(pings) / len(pings) if pings else None,
+                "handshake": sum(handshakes) / len(handshakes) if handshakes else None,
+            }
+
+    def serialize(self, tracker, sooth):
+        """
+        canonical json text of a sooth, or columnar binary with BINARY_ENCODING
+        """
+        metanode = self.constants.metanode
+        if metanode.BINARY_ENCODING and tracker in metanode.BINARY_TRACKERS:
+            return encode(sooth, metanode.BINARY_ZLIB_LEVEL)
+        return canonical(sooth)
+
+    def flush(self):
+        """
+        execute one atomic sql transaction for the whole iteration
+        each sooth is a single row upsert into the ring of its maven window
+        """
+        sooths, self.sooths = self.sooths, []
+        rates, self.rates = self.rates, {}
+        latencies, self.latencies = self.latencies, {}
+        # this prevents a maven Process from hard kill while db is accessed
+        if not (sooths or rates or latencies) or not self.maven_free.value:
+            return
+        # the maven serializes and digests each sooth once, so that the oracle
+        # can take the mode over digests and only ever read the winning text
+        sooths = [
+            (tracker, row, node, text, digest(text))
+            for tracker, row, node, text in (
+                (tracker, row, node, self.serialize(tracker, sooth))
+                for tracker, row, node, sooth in sooths
+            )
+        ]
+        alpha = self.constants.metanode.NODE_EWMA
+        rates = [dict(rate, alpha=alpha, url=node) for node, rate in rates.items()]
+        now = time.time()
+        latencies = [
+            dict(latency, alpha=alpha, sampled=now, url=node)
+            for node, latency in latencies.items()
+        ]
+        window = self.constants.metanode.MAVEN_WINDOW
+        values = []
+        if self.shared is None:
+            for tracker, row, node, text, sooth_digest in sooths:
+                table = self.constants.metanode.TRACKER_TABLE[tracker]
+                values.append(
+                    (
+                        table,
+                        row,
+                        tracker,
+                        window,
+                        node,
+                        sooth_digest,
+                        text,
+                        table,
+                        row,
+                        tracker,
                     )
-                # ascending pause here prevents excess cpu on corruption of database
-                # and allows for decreased load during race condition
-                time.sleep(min(5, 1.01**pause - 1))
-                continue
+                )
+
+        def write(cur):
+            cur.executemany(MAVEN_UPSERT, values)
+            cur.executemany(NODE_RATES_UPDATE, rates)
+            cur.executemany(NODE_PASSIVE_UPDATE, latencies)
+
+        def commit(cur):
+            """
+            commit only while this maven still holds its maven_id slot
+            """
+            with self.maven_free.get_lock():
+                if self.maven_free.value:
+                    cur.execute("COMMIT")
+                    if self.flushed is not None:
+                        self.flushed.value = time.time()
+                    return
+            # retired while writing; the slot belongs to a standby maven now
+            cur.connection.rollback()
+
+        # the parent takes this lock to retire a maven, so a write in progress
+        # drains before the maven_id slot is handed to a standby maven
+        # the lock is held only to check the slot and commit, never while waiting
+        # on the database, so a busy database cannot stall a handover
+        if self.shared is not None:
+            with self.maven_free.get_lock():
+                if not self.maven_free.value:
+                    return
+                for tracker, row, node, text, sooth_digest in sooths:
+                    if isinstance(text, str):
+                        text = text.encode()
+                    if not self.shared.write(
+                        tracker, row, self.maven_id, text, sooth_digest, node
+                    ):
+                        if DEV:
+                            print("maven error... shared slot refused", tracker, row)
+                if self.flushed is not None:
+                    self.flushed.value = time.time()
+        if values or rates or latencies:
+            # ==========================================================================
+            # SQL CONNECT ** minimize access time **
+            # ==========================================================================
+            self.sql.transaction(write, commit=commit)
+            # ==========================================================================
+            # SQL CLOSE
+            # ==========================================================================
 
 
 def unit_test():
@@ -20,6 +20,7 @@ from datetime import datetime
 from random import random
 from time import strptime, ctime
 from traceback import format_exc
+from types import MappingProxyType
 from typing import Dict
 import hashlib
 
@@ -60,6 +61,22 @@ def logger(*args, file="metanode_log.txt", identifier=PROCESS_START, **_):
         )
 
 
+def canonical(sooth) -> str:
+    """
+    deterministic json text of a sooth; equal sooths always serialize equally
+    """
+    return json.dumps(sooth, sort_keys=True, separators=(",", ":"))
+
+
+def digest(text) -> bytes:
+    """
+    16 byte blake2b content digest of canonical json text, or of columnar binary
+    """
+    if isinstance(text, str):
+        text = text.encode()
+    return hashlib.blake2b(text, digest_size=16).digest()
+
+
 def trace(error):
     """
     print stack trace upon exception
@@ -95,8 +112,25 @@ def ld2dd(list_of_dicts: list, key: str) -> dict:
         1 : { b:1 , c:3},
         1.1 : {b:2.1, c:3.1},
     }
+    rows with a without(key) method, eg. LazyRow, are copied without being decoded
+    """
+    return {
+        d[key]: d.without(key)
+        if hasattr(d, "without")
+        else {k: v for k, v in d.items() if k != key}
+        for d in list_of_dicts
+    }
+
+
+def freeze(obj):
+    """
+    a read only deep copy; dicts become MappingProxyType and lists become tuples
     """
-    return {d[key]: {k: v for k, v in d.items() if k != key} for d in list_of_dicts}
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(i) for i in obj)
+    return obj
 
 
 def blip(
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# DISABLE SELECT PYLINT TESTS
+# pylint: disable=bad-continuation
+r"""
+ ╔════════════════════════════════════════════════════╗
+ ║ ╔═╗╦═╗╔═╗╔═╗╦ ╦╔═╗╔╗╔╔═╗  ╔╦╗╔═╗╔╦╗╔═╗╔╗╔╔═╗╔╦╗╔═╗ ║
+ ║ ║ ╦╠╦╝╠═╣╠═╝╠═╣║╣ ║║║║╣   ║║║║╣  ║ ╠═╣║║║║ ║ ║║║╣  ║
+ ║ ╚═╝╩╚═╩ ╩╩  ╩ ╩╚═╝╝╚╝╚═╝  ╩ ╩╚═╝ ╩ ╩ ╩╝╚╝╚═╝═╩╝╚═╝ ║
+ ╚════════════════════════════════════════════════════╝
+ORACLE CONSENSUS AND COLUMN ENCODING BENCHMARK
+~
+times one oracle mode over a full maven window of realistic sooths
+    json:   json.loads / json.dumps every sample, then statistics.mode
+    digest: Counter mode over maven computed digests, copy only the winner
+the maven side cost of canonical json and blake2b is reported per sample
+~
+compares the bytes written and the decode time of one book, history and fills
+    json:   canonical json text, as stored without BINARY_ENCODING
+    binary: packed columns, uncompressed and at BINARY_ZLIB_LEVEL
+"""
+
+# STANDARD MODULES
+import json
+import time
+from collections import Counter
+from random import random, seed
+from statistics import mode
+from timeit import timeit
+
+# GRAPHENE MODULES
+from .graphene_codec import decode, encode
+from .graphene_constants import GrapheneConstants
+from .graphene_utils import canonical, digest, it
+
+
+def book_sooth(depth=50, skew=0):
+    """
+    an order book as returned by RemoteProcedureCall.book
+    """
+    return {
+        "asks": [[1.0 + i * 0.001 + skew * 1e-8, 100 * random()] for i in range(depth)],
+        "bids": [[1.0 - i * 0.001 - skew * 1e-8, 100 * random()] for i in range(depth)],
+    }
+
+
+def history_sooth(depth=100, skew=0):
+    """
+    a market history as returned by RemoteProcedureCall.market_history
+    """
+    now = int(time.time())
+    return [
+        [now - i * 60 - skew, 1.0 + random() / 100, 100 * random(), "BUY", 10000 - i]
+        for i in range(depth)
+    ]
+
+
+def fills_sooth(depth=20, skew=0):
+    """
+    our fills as returned by RemoteProcedureCall.fill_order_history
+    """
+    now = time.time()
+    return [
+        {
+            "exchange_order_id": f"1.7.{10000 + i}",
+            "unix": now - i * 600 - skew,
+            "sequence": 5000 - i,
+            "fee": {"asset": "BTS", "amount": 0.0482},
+            "is_maker": bool(i % 2),
+            "price": 1.0 + random() / 100,
+            "amount": 100 * random(),
+            "type": "BUY" if i % 3 else "SELL",
+        }
+        for i in range(depth)
+    ]
+
+
+def window_of(sooth_factory):
+    """
+    one maven window; most mavens agree, a couple of stale nodes do not
+    """
+    window = constants_window()
+    seed(1)
+    agreed = sooth_factory()
+    samples = [agreed] * (window - 2)
+    samples += [sooth_factory(skew=i + 1) for i in range(2)]
+    return samples
+
+
+def constants_window():
+    """
+    the configured maven window length
+    """
+    return GrapheneConstants().metanode.MAVEN_WINDOW
+
+
+def json_mode(texts):
+    """
+    the oracle consensus prior to content digests
+    """
+    return json.dumps(json.loads(mode([json.dumps(json.loads(i)) for i in texts])))
+
+
+def digest_mode(rows):
+    """
+    the oracle consensus over (digest, text) rows; only the winner is touched
+    """
+    winner = Counter(i[0] for i in rows).most_common(1)[0][0]
+    return next(text for sample_digest, text in rows if sample_digest == winner)
+
+
+def codec_test():
+    """
+    print the stored size and the decode cost of json and columnar binary
+    """
+    number = 200
+    level = GrapheneConstants().metanode.BINARY_ZLIB_LEVEL
+    for name, factory in [
+        ("book", book_sooth),
+        ("history", history_sooth),
+        ("fills", fills_sooth),
+    ]:
+        seed(1)
+        sooth = factory()
+        text = canonical(sooth)
+        packed = encode(sooth, 0)
+        zipped = encode(sooth, level)
+        assert json.loads(text) == decode(packed) == decode(zipped)
+        loads = timeit(lambda: json.loads(text), number=number) / number
+        unpack = timeit(lambda: decode(packed), number=number) / number
+        unzip = timeit(lambda: decode(zipped), number=number) / number
+        print(
+            it("yellow", name.ljust(8)),
+            "\n    json         ",
+            it("red", f"{len(text):7d} bytes {loads * 1e6:8.1f} us"),
+            "\n    binary       ",
+            it("green", f"{len(packed):7d} bytes {unpack * 1e6:8.1f} us"),
+            f"({len(text) / len(packed):.1f}x smaller)",
+            "\n    binary zlib  ",
+            it("green", f"{len(zipped):7d} bytes {unzip * 1e6:8.1f} us"),
+            f"({len(text) / len(zipped):.1f}x smaller)",
+        )
+
+
+def unit_test():
+    """
+    print the per window oracle cost of both consensus methods
+    then the cost of both column encodings
+    """
+    number = 200
+    for name, factory in [("book", book_sooth), ("history", history_sooth)]:
+        samples = window_of(factory)
+        texts = [canonical(i) for i in samples]
+        rows = [(digest(i), i) for i in texts]
+        assert json.loads(json_mode(texts)) == json.loads(digest_mode(rows))
+        maven = timeit(lambda: digest(canonical(samples[0])), number=number) / number
+        before = timeit(lambda: json_mode(texts), number=number) / number
+        after = timeit(lambda: digest_mode(rows), number=number) / number
+        print(
+            it("yellow", name.ljust(8)),
+            f"{len(texts[0])} bytes x {len(texts)} samples",
+            "\n    oracle json  ",
+            it("red", f"{before * 1e6:10.1f} us"),
+            "\n    oracle digest",
+            it("green", f"{after * 1e6:10.1f} us"),
+            f"({before / after:.0f}x)",
+            "\n    maven digest ",
+            it("blue", f"{maven * 1e6:10.1f} us"),
+            "per sample",
+        )
+    codec_test()
+
+
+if __name__ == "__main__":
+    unit_test()